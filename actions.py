@@ -4,85 +4,177 @@ Provides safe wrappers for element interactions with anti-detection measures
 """
 
 import time
+import math
 import random
-from typing import Optional, Union, Tuple
+import logging
+from typing import Optional, Union, Tuple, List, Dict, Any
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.select import Select
-from selenium.common.exceptions import TimeoutException, ElementNotInteractableException
+from selenium.common.exceptions import (
+    TimeoutException, ScriptTimeoutException, JavascriptException, ElementNotInteractableException
+)
 import base64
-from io import BytesIO
-from PIL import Image
+import hashlib
+
+log = logging.getLogger(__name__)
+
+
+# Parametric scroll scripts - the source never changes, so the browser can reuse the compiled script
+_SCROLL_BY_JS = "window.scrollBy({top: arguments[0], behavior: arguments[1]});"
+
+# Smooth scroll (by delta, or to top/bottom when delta is null) that resolves on scrollend, capped at 1.5 s
+_SMOOTH_SCROLL_JS = """
+    const done = arguments[arguments.length - 1];
+    const delta = arguments[0], toBottom = arguments[1];
+    const startY = window.scrollY;
+    let finished = false;
+    const finish = () => { if (!finished) { finished = true; done(); } };
+    window.addEventListener('scrollend', finish, {once: true});
+    setTimeout(finish, 1500);
+    if (delta === null) {
+        window.scrollTo({top: toBottom ? document.body.scrollHeight : 0, behavior: 'smooth'});
+    } else {
+        window.scrollBy({top: delta, behavior: 'smooth'});
+    }
+    // Already at the target - nothing moves, so scrollend never fires
+    setTimeout(() => { if (window.scrollY === startY) finish(); }, 100);
+"""
+
+# Resolves immediately if the document is complete, otherwise on the window 'load' event
+_PAGE_LOAD_JS = """
+    const done = arguments[arguments.length - 1];
+    if (document.readyState === 'complete') return done();
+    window.addEventListener('load', () => done(), {once: true});
+"""
+
+# Resolves true once no resource has finished loading for idle_ms, or false after cap_ms.
+# An observer sees every entry, unlike the resource timing buffer, which stops at 250
+_NETWORK_IDLE_JS = """
+    const done = arguments[arguments.length - 1];
+    const idleMs = arguments[0], capMs = arguments[1];
+    const start = performance.now();
+    let last = start;
+    const observer = new PerformanceObserver(() => { last = performance.now(); });
+    observer.observe({type: 'resource'});
+    const tick = () => {
+        const now = performance.now();
+        if (now - last >= idleMs || now - start >= capMs) {
+            observer.disconnect();
+            return done(now - last >= idleMs);
+        }
+        setTimeout(tick, 50);
+    };
+    tick();
+"""
 
 
 class BrowserActions:
     """Handles all browser interactions with human-like behavior"""
     
-    def __init__(self, driver):
+    def __init__(self, driver, network_idle: bool = False):
         self.driver = driver
         self.wait = WebDriverWait(driver, 10)
+        # Wait for network idle after clicks/submits instead of a fixed random sleep
+        self.network_idle = network_idle
+        # User agent is fixed for the driver's lifetime, so resolve mobile mode once
+        user_agent = getattr(driver, "user_agent", None) or driver.execute_script("return navigator.userAgent;")
+        self._mobile = any(k in user_agent for k in ("Mobile", "Android", "iPhone"))
+        # SHA-256 of the last screenshot, reset on navigation
+        self._last_shot_hash = None
+        # One ActionChains reused for every pointer interaction
+        self._ac = ActionChains(driver)
+        # window.innerHeight, cached until the next page load / navigation
+        self._viewport_h = None
+        # Last pointer position we moved to (viewport coordinates)
+        self._cursor_x = self._cursor_y = 0
+        # Parsed (By, value) locators keyed by identifier string
+        self._loc_cache: Dict[str, Tuple[str, str]] = {}
         
-    def type_text(self, element: Union[str, WebElement], text: str, clear_first: bool = True) -> bool:
-        """Type text with enhanced human-like behavior"""
+    def type_text(self, element: Union[str, WebElement], text: str, clear_first: bool = True,
+                  human: bool = True) -> bool:
+        """Type text with enhanced human-like behavior (human=False sends it in one keystroke batch)"""
         try:
-            # Get element if string ID provided
-            if isinstance(element, str):
-                element = self._get_element(element)
-            
-            if not element:
-                print(f"[ERROR] Element not found for typing")
-                return False
-            
+            return self._do_type(element, text, clear_first, pace=human, human=human)
+        except Exception as e:
+            log.error("Failed to type text: %s", e)
+            return False
+    
+    def _do_type(self, element: Union[str, WebElement], text: str, clear_first: bool = True,
+                 pace: bool = True, human: bool = True) -> bool:
+        """Type into element; pace=False skips the human approach and pauses"""
+        # Get element if string ID provided
+        if isinstance(element, str):
+            element = self._get_element(element)
+        
+        if not element:
+            log.error("Element not found for typing")
+            return False
+        
+        if pace:
             # Human-like approach to the element
             self._human_mouse_movement(element)
             
             # Scroll element into view
             self.scroll_to_element(element)
             time.sleep(random.uniform(0.5, 1.2))  # Longer pause like human reading
-            
-            # Click to focus with slight delay
-            element.click()
+        
+        # Click to focus with slight delay
+        element.click()
+        if pace:
             time.sleep(random.uniform(0.3, 0.7))
-            
-            # Clear if requested
-            if clear_first and element.get_attribute('value'):
-                if self._is_mobile():
-                    # Mobile clear method
-                    element.clear()
-                else:
-                    # Desktop clear with keyboard
-                    element.send_keys(Keys.CONTROL + "a")
+        
+        # Clear if requested
+        if clear_first and element.get_attribute('value'):
+            if self._is_mobile():
+                # Mobile clear method
+                element.clear()
+            else:
+                # Desktop clear with keyboard
+                element.send_keys(Keys.CONTROL + "a")
+                if pace:
                     time.sleep(random.uniform(0.1, 0.3))
-                    element.send_keys(Keys.DELETE)
+                element.send_keys(Keys.DELETE)
+            if pace:
                 time.sleep(random.uniform(0.3, 0.6))
-            
+        
+        if human:
             # Enhanced human-like typing with mistakes and corrections
             self._type_like_human(element, text)
-            
-            print(f"[ACTION] Typed text: '{text[:30]}...'")
-            return True
-            
-        except Exception as e:
-            print(f"[ERROR] Failed to type text: {e}")
-            return False
+        else:
+            # Trusted context: one send_keys round trip for the whole string
+            element.send_keys(text)
+        
+        log.debug("Typed text: '%s...'", text[:30])
+        return True
     
     def click_element(self, element: Union[str, WebElement], use_js: bool = False) -> bool:
         """Click element with random offset"""
         try:
-            # Get element if string ID provided
-            if isinstance(element, str):
-                element = self._get_element(element)
-            
-            if not element:
-                print(f"[ERROR] Element not found for clicking")
-                return False
-            
-            # Scroll element into view
-            self.scroll_to_element(element)
-            time.sleep(random.uniform(0.3, 0.6))
+            return self._do_click(element, use_js)
+        except Exception as e:
+            log.error("Failed to click element: %s", e)
+            return False
+    
+    def _do_click(self, element: Union[str, WebElement], use_js: bool = False, pace: bool = True) -> bool:
+        """Click element; pace=False skips the settle pauses around the click"""
+        # Get element if string ID provided
+        if isinstance(element, str):
+            element = self._get_element(element)
+        
+        if not element:
+            log.error("Element not found for clicking")
+            return False
+        
+        try:
+            if pace:
+                # Scroll element into view
+                self.scroll_to_element(element)
+                time.sleep(random.uniform(0.3, 0.6))
             
             if use_js or self._is_mobile():
                 # Use JavaScript click for mobile or when requested
@@ -91,102 +183,77 @@ class BrowserActions:
                 # Try regular click with offset
                 try:
                     # Get element size
-                    size = element.size
-                    # Click with random offset from center
-                    offset_x = random.randint(-size['width']//4, size['width']//4)
-                    offset_y = random.randint(-size['height']//4, size['height']//4)
-                    
-                    from selenium.webdriver.common.action_chains import ActionChains
-                    actions = ActionChains(self.driver)
-                    actions.move_to_element_with_offset(element, offset_x, offset_y)
-                    actions.click()
-                    actions.perform()
+                    rect = self._rect(element)
+                    if rect['width'] * rect['height'] == 0:
+                        # Nothing to aim the pointer at - click via JS instead
+                        self.driver.execute_script("arguments[0].click();", element)
+                    else:
+                        # Click with random offset from center
+                        offset_x = random.randint(-rect['width']//4, rect['width']//4)
+                        offset_y = random.randint(-rect['height']//4, rect['height']//4)
+                        actions = self._action_chain()
+                        actions.move_to_element_with_offset(element, offset_x, offset_y)
+                        actions.click()
+                        actions.perform()
                 except:
                     # Fallback to simple click
                     element.click()
             
-            print(f"[ACTION] Clicked element")
-            time.sleep(random.uniform(0.5, 1.0))  # Wait after click
+            log.debug("Clicked element")
+            if pace:
+                self._settle(0.5, 1.0)  # Wait after click
             return True
             
         except ElementNotInteractableException:
             # Try JavaScript click as fallback
             if not use_js:
-                print("[WARN] Element not interactable, trying JS click")
-                return self.click_element(element, use_js=True)
-            print(f"[ERROR] Element not clickable")
-            return False
-        except Exception as e:
-            print(f"[ERROR] Failed to click element: {e}")
+                log.warning("Element not interactable, trying JS click")
+                return self._do_click(element, use_js=True, pace=pace)
+            log.error("Element not clickable")
             return False
     
     def scroll_page(self, direction: str = "down", amount: int = None) -> bool:
         """Scroll the page with human-like patterns"""
         try:
-            # Add random micro-scrolls like humans do while reading
-            if random.random() < 0.3:  # 30% chance of micro-scroll first
-                micro_amount = random.randint(10, 50)
-                self.driver.execute_script(f"window.scrollBy(0, {micro_amount});")
-                time.sleep(random.uniform(0.1, 0.3))
-            
-            if direction == "down":
-                if amount:
-                    # Scroll specific amount with variation
-                    actual_amount = amount + random.randint(-20, 20)
-                    self.driver.execute_script(f"""
-                        window.scrollBy({{
-                            top: {actual_amount},
-                            behavior: 'smooth'
-                        }});
-                    """)
-                else:
-                    # Variable scroll distance (like humans)
-                    viewport_height = self.driver.execute_script("return window.innerHeight;")
-                    scroll_factor = random.uniform(0.5, 0.9)  # Random amount
-                    self.driver.execute_script(f"""
-                        window.scrollBy({{
-                            top: {viewport_height * scroll_factor},
-                            behavior: 'smooth'
-                        }});
-                    """)
-            elif direction == "up":
-                if amount:
-                    actual_amount = amount + random.randint(-20, 20)
-                    self.driver.execute_script(f"""
-                        window.scrollBy({{
-                            top: -{actual_amount},
-                            behavior: 'smooth'
-                        }});
-                    """)
-                else:
-                    viewport_height = self.driver.execute_script("return window.innerHeight;")
-                    scroll_factor = random.uniform(0.3, 0.7)
-                    self.driver.execute_script(f"""
-                        window.scrollBy({{
-                            top: -{viewport_height * scroll_factor},
-                            behavior: 'smooth'
-                        }});
-                    """)
-            elif direction == "top":
-                self.driver.execute_script("window.scrollTo({top: 0, behavior: 'smooth'});")
-            elif direction == "bottom":
-                self.driver.execute_script("window.scrollTo({top: document.body.scrollHeight, behavior: 'smooth'});")
-            
-            # Variable wait time after scroll
-            time.sleep(random.uniform(0.3, 1.5))
-            
+            return self._do_scroll(direction, amount)
+        except Exception as e:
+            log.error("Failed to scroll: %s", e)
+            return False
+    
+    def _do_scroll(self, direction: str = "down", amount: int = None, pace: bool = True) -> bool:
+        """Scroll the page; pace=False skips micro/correction scrolls and pauses"""
+        # Add random micro-scrolls like humans do while reading
+        if pace and random.random() < 0.3:  # 30% chance of micro-scroll first
+            micro_amount = random.randint(10, 50)
+            self.driver.execute_script(_SCROLL_BY_JS, micro_amount, "auto")
+            time.sleep(random.uniform(0.1, 0.3))
+        
+        if direction in ("down", "up"):
+            if amount:
+                # Scroll specific amount with variation
+                delta = amount + random.randint(-20, 20)
+            else:
+                # Variable scroll distance (like humans)
+                if self._viewport_h is None:
+                    self._viewport_h = self.driver.execute_script("return window.innerHeight;")
+                viewport_height = self._viewport_h
+                low, high = (0.5, 0.9) if direction == "down" else (0.3, 0.7)
+                delta = viewport_height * random.uniform(low, high)
+            if direction == "up":
+                delta = -delta
+            self.driver.execute_async_script(_SMOOTH_SCROLL_JS, delta, False)
+        elif direction in ("top", "bottom"):
+            self.driver.execute_async_script(_SMOOTH_SCROLL_JS, None, direction == "bottom")
+        
+        if pace:
             # Sometimes do a small correction scroll (human behavior)
             if random.random() < 0.2:  # 20% chance
                 correction = random.randint(-30, 30)
-                self.driver.execute_script(f"window.scrollBy(0, {correction});")
+                self.driver.execute_script(_SCROLL_BY_JS, correction, "auto")
                 time.sleep(random.uniform(0.2, 0.4))
-            
-            print(f"[ACTION] Scrolled {direction}")
-            return True
-            
-        except Exception as e:
-            print(f"[ERROR] Failed to scroll: {e}")
-            return False
+        
+        log.debug("Scrolled %s", direction)
+        return True
     
     def reading_scroll_pattern(self):
         """Simulate human reading pattern with scrolling"""
@@ -216,20 +283,26 @@ class BrowserActions:
             if not element:
                 return False
             
-            # Scroll element to center of viewport
-            self.driver.execute_script("""
+            # Scroll element to center of viewport, unless it's already fully visible
+            in_view = self.driver.execute_script("""
+                const r = arguments[0].getBoundingClientRect();
+                if (r.top >= 0 && r.bottom <= window.innerHeight) {
+                    return true;
+                }
                 arguments[0].scrollIntoView({
                     behavior: 'smooth',
                     block: 'center',
                     inline: 'center'
                 });
+                return false;
             """, element)
             
-            time.sleep(random.uniform(0.3, 0.5))
+            if not in_view:
+                time.sleep(random.uniform(0.3, 0.5))
             return True
             
         except Exception as e:
-            print(f"[ERROR] Failed to scroll to element: {e}")
+            log.error("Failed to scroll to element: %s", e)
             return False
     
     def submit_form(self, element: Union[str, WebElement] = None) -> bool:
@@ -248,8 +321,8 @@ class BrowserActions:
                 form = self.driver.find_element(By.TAG_NAME, "form")
                 form.submit()
             
-            print("[ACTION] Submitted form")
-            time.sleep(random.uniform(1.0, 2.0))  # Wait for submission
+            log.debug("Submitted form")
+            self._settle(1.0, 2.0)  # Wait for submission
             return True
             
         except Exception as e:
@@ -257,128 +330,230 @@ class BrowserActions:
             try:
                 if element:
                     element.send_keys(Keys.RETURN)
-                    print("[ACTION] Submitted with Enter key")
-                    time.sleep(random.uniform(1.0, 2.0))
+                    log.debug("Submitted with Enter key")
+                    self._settle(1.0, 2.0)
                     return True
             except:
                 pass
             
-            print(f"[ERROR] Failed to submit form: {e}")
+            log.error("Failed to submit form: %s", e)
             return False
     
     def select_option(self, element: Union[str, WebElement], option: str, by: str = "text") -> bool:
         """Select option from dropdown"""
         try:
-            # Get element if string ID provided
-            if isinstance(element, str):
-                element = self._get_element(element)
-            
-            if not element:
-                print(f"[ERROR] Select element not found")
-                return False
-            
+            return self._do_select(element, option, by)
+        except Exception as e:
+            log.error("Failed to select option: %s", e)
+            return False
+    
+    def _do_select(self, element: Union[str, WebElement], option: str, by: str = "text",
+                   pace: bool = True) -> bool:
+        """Select option; pace=False skips scrolling into view and the pause"""
+        # Get element if string ID provided
+        if isinstance(element, str):
+            element = self._get_element(element)
+        
+        if not element:
+            log.error("Select element not found")
+            return False
+        
+        if pace:
             # Scroll element into view
             self.scroll_to_element(element)
             time.sleep(random.uniform(0.3, 0.5))
-            
-            select = Select(element)
-            
-            if by == "text":
-                select.select_by_visible_text(option)
-            elif by == "value":
-                select.select_by_value(option)
-            elif by == "index":
-                select.select_by_index(int(option))
-            
-            print(f"[ACTION] Selected option: {option}")
-            return True
-            
-        except Exception as e:
-            print(f"[ERROR] Failed to select option: {e}")
-            return False
+        
+        select = Select(element)
+        
+        if by == "text":
+            select.select_by_visible_text(option)
+        elif by == "value":
+            select.select_by_value(option)
+        elif by == "index":
+            select.select_by_index(int(option))
+        
+        log.debug("Selected option: %s", option)
+        return True
+    
+    def bulk_actions(self, actions: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Execute a batch of independent actions in one call, without human pauses.
+        Each entry has a "type" ("type", "click", "select_option", "scroll") plus
+        its parameters, e.g. {"type": "type", "ref": "#q", "text": "hello", "human": False}.
+        Waits for the page to settle once at the end; returns one status per action.
+        """
+        results = []
+        for action in actions:
+            kind = action.get("type")
+            try:
+                if kind == "type":
+                    ok = self._do_type(action["ref"], action["text"],
+                                       action.get("clear_first", True), pace=False,
+                                       human=action.get("human", True))
+                elif kind == "click":
+                    ok = self._do_click(action["ref"], action.get("use_js", False), pace=False)
+                elif kind == "select_option":
+                    ok = self._do_select(action["ref"], action["option"],
+                                         action.get("by", "text"), pace=False)
+                elif kind == "scroll":
+                    ok = self._do_scroll(action.get("direction", "down"),
+                                         action.get("amount"), pace=False)
+                else:
+                    log.warning("Unknown bulk action: %s", kind)
+                    ok = False
+            except Exception as e:
+                log.error("Bulk action '%s' failed: %s", kind, e)
+                ok = False
+            results.append(ok)
+        
+        self.wait_for_page_load()
+        log.debug("Bulk actions: %s/%s succeeded", sum(results), len(results))
+        return results
     
     def wait_for_element(self, selector: str, by: By = By.CSS_SELECTOR, timeout: int = 10) -> Optional[WebElement]:
         """Wait for element to be present and visible"""
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by, selector))
+            # Present and visible, checked together in one poll loop
+            return WebDriverWait(self.driver, timeout).until(
+                EC.visibility_of_element_located((by, selector))
             )
-            # Also wait for it to be visible
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of(element)
-            )
-            return element
         except TimeoutException:
-            print(f"[WARN] Element not found: {selector}")
+            log.warning("Element not found: %s", selector)
             return None
     
-    def wait_for_page_load(self, timeout: int = 10) -> bool:
-        """Wait for page to finish loading"""
+    def wait_for_page_load(self, timeout: int = 10, settle: bool = True) -> bool:
+        """Wait for page to finish loading (settle=False skips the extra pause for dynamic content)"""
         try:
-            # Wait for document ready state
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
+            self._viewport_h = None
+            
+            # Wait for document ready state - the browser signals 'load' instead of us polling
+            deadline = time.monotonic() + timeout
+            # Shrunk per attempt below; put it back so later async scripts get their full budget
+            script_timeout = self.driver.timeouts.script
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutException()
+                    self.driver.set_script_timeout(remaining)
+                    try:
+                        self.driver.execute_async_script(_PAGE_LOAD_JS)
+                        break
+                    except JavascriptException:
+                        # Document unloaded mid-wait (navigation in flight) - wait on the new one
+                        continue
+            finally:
+                self.driver.set_script_timeout(script_timeout)
             
             # Additional wait for dynamic content
-            time.sleep(random.uniform(0.5, 1.0))
+            if settle:
+                time.sleep(random.uniform(0.5, 1.0))
             
-            print("[ACTION] Page loaded")
+            log.debug("Page loaded")
             return True
-        except TimeoutException:
-            print("[WARN] Page load timeout")
+        except (TimeoutException, ScriptTimeoutException):
+            log.warning("Page load timeout")
             return False
     
+    def wait_for_network_idle(self, timeout: float = 1.5, idle_ms: int = 500) -> bool:
+        """Wait until no new network requests complete for idle_ms (capped at timeout seconds)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                return False
+            try:
+                return bool(self.driver.execute_async_script(_NETWORK_IDLE_JS, idle_ms, remaining_ms))
+            except JavascriptException:
+                # Document unloaded mid-wait (the click/submit navigated) - wait on the new one
+                time.sleep(0.05)
+                continue
+            except Exception:
+                return False
+    
+    def _settle(self, low: float, high: float):
+        """Pause after an action - network-idle wait if enabled, else a random sleep"""
+        if self.network_idle:
+            self.wait_for_network_idle()
+        else:
+            time.sleep(random.uniform(low, high))
+    
     def go_back(self) -> bool:
         """Navigate back in browser history"""
         try:
             self.driver.back()
+            self._last_shot_hash = None
+            self._viewport_h = None
             time.sleep(random.uniform(1.0, 2.0))
-            print("[ACTION] Navigated back")
+            log.debug("Navigated back")
             return True
         except Exception as e:
-            print(f"[ERROR] Failed to go back: {e}")
+            log.error("Failed to go back: %s", e)
             return False
     
     def go_forward(self) -> bool:
         """Navigate forward in browser history"""
         try:
             self.driver.forward()
+            self._last_shot_hash = None
+            self._viewport_h = None
             time.sleep(random.uniform(1.0, 2.0))
-            print("[ACTION] Navigated forward")
+            log.debug("Navigated forward")
             return True
         except Exception as e:
-            print(f"[ERROR] Failed to go forward: {e}")
+            log.error("Failed to go forward: %s", e)
             return False
     
     def refresh_page(self) -> bool:
         """Refresh the current page"""
         try:
             self.driver.refresh()
+            self._last_shot_hash = None
+            self._viewport_h = None
             self.wait_for_page_load()
-            print("[ACTION] Page refreshed")
+            log.debug("Page refreshed")
             return True
         except Exception as e:
-            print(f"[ERROR] Failed to refresh: {e}")
+            log.error("Failed to refresh: %s", e)
             return False
     
     def take_screenshot(self, filename: str = None) -> str:
         """Take a screenshot and return base64 encoded image"""
         try:
-            if filename:
-                self.driver.save_screenshot(filename)
-                print(f"[ACTION] Screenshot saved to {filename}")
-                with open(filename, "rb") as f:
-                    return base64.b64encode(f.read()).decode()
-            else:
-                # Return base64 encoded screenshot
-                png = self.driver.get_screenshot_as_png()
-                print("[ACTION] Screenshot captured")
-                return base64.b64encode(png).decode()
+            png = self._capture_png(filename)
+            self._last_shot_hash = hashlib.sha256(png).digest()
+            return base64.b64encode(png).decode()
+        except Exception as e:
+            log.error("Failed to take screenshot: %s", e)
+            return ""
+    
+    def take_screenshot_if_changed(self, filename: str = None) -> Optional[str]:
+        """
+        Like take_screenshot, but returns None (skipping the base64 encode) when the page
+        is pixel-identical to the previous capture since the last navigation.
+        """
+        try:
+            png = self._capture_png(filename)
+            shot_hash = hashlib.sha256(png).digest()
+            if shot_hash == self._last_shot_hash:
+                return None
+            self._last_shot_hash = shot_hash
+            return base64.b64encode(png).decode()
         except Exception as e:
-            print(f"[ERROR] Failed to take screenshot: {e}")
+            log.error("Failed to take screenshot: %s", e)
             return ""
     
+    def _capture_png(self, filename: Optional[str]) -> bytes:
+        """Screenshot as PNG bytes, also written to filename if given"""
+        png = self.driver.get_screenshot_as_png()
+        if filename:
+            with open(filename, "wb") as f:
+                f.write(png)
+            log.debug("Screenshot saved to %s", filename)
+        else:
+            log.debug("Screenshot captured")
+        return png
+    
     def get_current_url(self) -> str:
         """Get current page URL"""
         return self.driver.current_url
@@ -390,45 +565,74 @@ class BrowserActions:
     def _get_element(self, identifier: str) -> Optional[WebElement]:
         """Get element by various methods"""
         try:
-            # Try ID first
-            if identifier.startswith("#"):
-                return self.driver.find_element(By.ID, identifier[1:])
-            # Try class
-            elif identifier.startswith("."):
-                return self.driver.find_element(By.CLASS_NAME, identifier[1:])
-            # Try CSS selector
-            elif " " in identifier or ">" in identifier or "[" in identifier:
-                return self.driver.find_element(By.CSS_SELECTOR, identifier)
-            # Default to ID
-            else:
-                return self.driver.find_element(By.ID, identifier)
+            locator = self._loc_cache.get(identifier)
+            if locator is None:
+                locator = self._loc_cache[identifier] = self._parse_locator(identifier)
+            return self.driver.find_element(*locator)
         except:
             return None
     
+    @staticmethod
+    def _parse_locator(identifier: str) -> Tuple[str, str]:
+        """Map an identifier string to a (By, value) locator"""
+        # Try ID first
+        if identifier.startswith("#"):
+            return By.ID, identifier[1:]
+        # Try class
+        elif identifier.startswith("."):
+            return By.CLASS_NAME, identifier[1:]
+        # Try CSS selector
+        elif " " in identifier or ">" in identifier or "[" in identifier:
+            return By.CSS_SELECTOR, identifier
+        # Default to ID
+        else:
+            return By.ID, identifier
+    
+    def _rect(self, element: WebElement) -> Dict[str, int]:
+        """Read element viewport position and size in a single round trip"""
+        rect = self.driver.execute_script("""
+            const r = arguments[0].getBoundingClientRect();
+            return {x: r.left, y: r.top, width: r.width, height: r.height};
+        """, element)
+        return {k: int(v) for k, v in rect.items()}
+    
+    def _action_chain(self) -> ActionChains:
+        """Return the shared ActionChains with any unperformed actions dropped"""
+        # Clear device queues locally - reset_actions() would also cost a driver round trip
+        for device in self._ac.w3c_actions.devices:
+            device.clear_actions()
+        return self._ac
+    
     def _human_mouse_movement(self, element):
-        """Simulate human-like mouse movement to element"""
+        """Simulate human-like mouse movement to element along an eased path"""
         if not self._is_mobile():
             try:
-                from selenium.webdriver.common.action_chains import ActionChains
-                actions = ActionChains(self.driver)
+                # Get element position and size in one round trip
+                rect = self._rect(element)
+                if rect['width'] * rect['height'] == 0:
+                    return  # Hidden or collapsed - nothing to move to
                 
-                # Get element location
-                location = element.location
-                size = element.size
+                # Aim near the center, never dead-on
+                target_x = rect['x'] + rect['width']//2 + random.randint(-5, 5)
+                target_y = rect['y'] + rect['height']//2 + random.randint(-5, 5)
                 
-                # Random approach path (not direct)
-                intermediate_x = location['x'] + random.randint(-50, 50)
-                intermediate_y = location['y'] + random.randint(-50, 50)
+                # More sub-steps for longer moves, eased in and out like a real hand
+                start_x, start_y = self._cursor_x, self._cursor_y
+                distance = math.hypot(target_x - start_x, target_y - start_y)
+                steps = min(40, max(3, int(distance / 15)))
+                step_ms = int(random.uniform(200, 600) / steps)
                 
-                # Move to intermediate point first
-                actions.move_by_offset(intermediate_x, intermediate_y)
-                actions.pause(random.uniform(0.1, 0.3))
-                
-                # Then to the element
-                target_x = location['x'] + size['width']//2 + random.randint(-5, 5)
-                target_y = location['y'] + size['height']//2 + random.randint(-5, 5)
-                actions.move_by_offset(target_x - intermediate_x, target_y - intermediate_y)
+                # Whole path goes out in a single perform()
+                actions = self._action_chain()
+                pointer = actions.w3c_actions.pointer_action.source
+                for i in range(1, steps + 1):
+                    t = i / steps
+                    ease = 3 * t**2 - 2 * t**3
+                    pointer.create_pointer_move(duration=step_ms, origin="viewport",
+                                                x=int(start_x + ease * (target_x - start_x)),
+                                                y=int(start_y + ease * (target_y - start_y)))
                 actions.perform()
+                self._cursor_x, self._cursor_y = target_x, target_y
                 
                 time.sleep(random.uniform(0.1, 0.3))
             except:
@@ -437,6 +641,9 @@ class BrowserActions:
     def _type_like_human(self, element, text):
         """Type text with human-like patterns including occasional mistakes"""
         words = text.split(' ')
+        # Pre-draw the per-character rhythm for the whole string in one pass
+        delays = self._keystroke_delays(text)
+        pos = 0
         
         for i, word in enumerate(words):
             # Occasionally make a typo and correct it
@@ -456,18 +663,13 @@ class BrowserActions:
                 element.send_keys(word[-1])
                 time.sleep(random.uniform(0.1, 0.2))
             else:
-                # Type normally with variable speed
-                for char in word:
+                # Type normally with variable speed; the send_keys round trip counts
+                # toward each delay instead of stretching every keystroke interval
+                for char, delay in zip(word, delays[pos:pos + len(word)]):
+                    next_key = time.monotonic() + delay
                     element.send_keys(char)
-                    # Realistic typing rhythm
-                    if char in 'aeiou':  # Vowels typed slightly faster
-                        time.sleep(random.uniform(0.08, 0.12))
-                    else:
-                        time.sleep(random.uniform(0.12, 0.18))
-                    
-                    # Occasional longer pause (thinking)
-                    if random.random() < 0.03:
-                        time.sleep(random.uniform(0.3, 0.8))
+                    time.sleep(max(0.0, next_key - time.monotonic()))
+            pos += len(word) + 1
             
             # Add space between words
             if i < len(words) - 1:
@@ -478,10 +680,21 @@ class BrowserActions:
                 if random.random() < 0.1:
                     time.sleep(random.uniform(0.5, 1.2))
 
+    @staticmethod
+    def _keystroke_delays(text: str) -> List[float]:
+        """Per-character typing delays, including occasional longer thinking pauses"""
+        uniform, chance = random.uniform, random.random
+        return [
+            # Realistic typing rhythm - vowels typed slightly faster
+            (uniform(0.08, 0.12) if char in 'aeiou' else uniform(0.12, 0.18))
+            # Occasional longer pause (thinking)
+            + (uniform(0.3, 0.8) if chance() < 0.03 else 0.0)
+            for char in text
+        ]
+    
     def _is_mobile(self) -> bool:
         """Check if running in mobile mode"""
-        user_agent = self.driver.execute_script("return navigator.userAgent;")
-        return "Mobile" in user_agent or "Android" in user_agent or "iPhone" in user_agent
+        return self._mobile
     
     def hover_element(self, element: Union[str, WebElement]) -> bool:
         """Hover over an element"""
@@ -505,15 +718,14 @@ class BrowserActions:
                     }, 1000);
                 """, element)
             else:
-                from selenium.webdriver.common.action_chains import ActionChains
-                actions = ActionChains(self.driver)
+                actions = self._action_chain()
                 actions.move_to_element(element)
                 actions.perform()
             
             time.sleep(random.uniform(0.3, 0.5))
-            print("[ACTION] Hovered over element")
+            log.debug("Hovered over element")
             return True
             
         except Exception as e:
-            print(f"[ERROR] Failed to hover: {e}")
+            log.error("Failed to hover: %s", e)
             return False
\ No newline at end of file
@@ -17,7 +17,14 @@ import time
 import random
 import re
 import shutil
+import tempfile
+import atexit
+import hashlib
+import json
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+from dataclasses import dataclass, field
 
 try:
     from dotenv import load_dotenv
@@ -34,17 +41,322 @@ except ImportError as e:
 load_dotenv()
 
 
+@dataclass(frozen=True)
+class _EnvConfig:
+    """Environment settings, read once at import (they don't change mid-process)"""
+    proxy: Optional[str] = os.getenv("BRIGHTDATA_PROXY")
+    chrome_path: Optional[str] = os.getenv("CHROME_PATH")
+    reuse_profile: bool = os.getenv("BRIGHTDATA_REUSE_PROFILE") == "1"
+    chrome_version_main: Optional[int] = (
+        int(os.getenv("CHROME_VERSION_MAIN")) if (os.getenv("CHROME_VERSION_MAIN") or "").isdigit() else None
+    )
+    # CA material keyed by variable name, as passed to _write_cert_from_env
+    ca: dict = field(default_factory=lambda: {
+        name: os.getenv(name) for name in (
+            "BRIGHTDATA_CA_B64", "BRIGHTDATA_CA_PEM", "SELENIUMWIRE_CA_B64", "SELENIUMWIRE_CA_PEM",
+        )
+    })
+
+
+_ENV = _EnvConfig()
+
+_SYSTEM = platform.system().lower()
+
+# Where to look for Chrome on this OS: absolute paths (Windows/macOS) or,
+# on Linux, executable names resolved lazily via PATH
+if _SYSTEM == "windows":
+    _CHROME_CANDIDATES = (
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    )
+elif _SYSTEM == "darwin":
+    _CHROME_CANDIDATES = (
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    )
+else:  # linux
+    _CHROME_CANDIDATES = ("google-chrome", "google-chrome-stable", "chrome", "chromium", "chromium-browser")
+
+# "Google Chrome 138.0.7204.184" -> 138 (chrome --version fallback), and the
+# versioned payload directory name on Windows
+_CHROME_VER_RE = re.compile(r"(\d+)\.")
+_CHROME_VER_DIR_RE = re.compile(r"\d+(\.\d+){3}")
+
+# Chrome discovery results, shared by every BrowserSetup in the process
+# (_MISSING = not probed yet, so a None result is cached too)
+_MISSING = object()
+_CHROME_BIN_CACHE = _MISSING
+_CHROME_VER_CACHE = _MISSING
+
+
+def _minify_js(src: str) -> str:
+    """Drop full-line // comments, indentation and blank lines (newlines kept for ASI)"""
+    lines = (line.strip() for line in src.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+# Enhanced stealth with proper plugin emulation. Registered once per driver via
+# Page.addScriptToEvaluateOnNewDocument, so Chrome runs it before page scripts in
+# every new document; wrapped in a function so the early return is valid there.
+_STEALTH_ON_NEW_DOC = {"source": _minify_js("""
+(() => {
+// Check if already applied
+if (window.__stealthApplied) {
+    return;
+}
+window.__stealthApplied = true;
+
+// Remove webdriver property (with check)
+try {
+    if (navigator.webdriver !== false) {
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => false,
+        });
+    }
+} catch (e) {
+    // Property already defined
+}
+
+// Realistic plugins array
+const pluginData = [
+    {name: 'PDF Viewer', filename: 'internal-pdf-viewer', description: 'Portable Document Format'},
+    {name: 'Chrome PDF Viewer', filename: 'internal-pdf-viewer', description: 'Portable Document Format'},
+    {name: 'Chromium PDF Viewer', filename: 'internal-pdf-viewer', description: 'Portable Document Format'},
+    {name: 'Microsoft Edge PDF Viewer', filename: 'internal-pdf-viewer', description: 'Portable Document Format'},
+    {name: 'WebKit built-in PDF', filename: 'internal-pdf-viewer', description: 'Portable Document Format'}
+];
+
+const plugins = pluginData.map(p => {
+    const plugin = {};
+    plugin.name = p.name;
+    plugin.filename = p.filename;
+    plugin.description = p.description;
+    plugin.length = 1;
+    plugin[0] = {
+        type: 'application/pdf',
+        suffixes: 'pdf',
+        description: 'Portable Document Format'
+    };
+    return plugin;
+});
+
+try {
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => plugins,
+    });
+} catch (e) {}
+
+// Proper languages
+try {
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en'],
+    });
+} catch (e) {}
+
+try {
+    Object.defineProperty(navigator, 'language', {
+        get: () => 'en-US',
+    });
+} catch (e) {}
+
+// Hide chrome automation
+if (window.chrome) {
+    window.chrome.runtime = undefined;
+    window.chrome.loadTimes = function() {};
+    window.chrome.csi = function() {};
+}
+
+// Override permissions
+if (navigator.permissions && navigator.permissions.query) {
+    const originalQuery = navigator.permissions.query;
+    navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+}
+
+// Realistic screen properties
+try {
+    Object.defineProperty(screen, 'availWidth', {
+        get: () => screen.width,
+    });
+} catch (e) {}
+
+try {
+    Object.defineProperty(screen, 'availHeight', {
+        get: () => screen.height - 40,
+    });
+} catch (e) {}
+
+// WebGL Vendor and Renderer
+const getParameter = WebGLRenderingContext.prototype.getParameter;
+WebGLRenderingContext.prototype.getParameter = function(parameter) {
+    if (parameter === 37445) {
+        return 'Intel Inc.';
+    }
+    if (parameter === 37446) {
+        return 'Intel Iris OpenGL Engine';
+    }
+    return getParameter.apply(this, arguments);
+};
+
+const getParameter2 = WebGL2RenderingContext.prototype.getParameter;
+WebGL2RenderingContext.prototype.getParameter = function(parameter) {
+    if (parameter === 37445) {
+        return 'Intel Inc.';
+    }
+    if (parameter === 37446) {
+        return 'Intel Iris OpenGL Engine';
+    }
+    return getParameter2.apply(this, arguments);
+};
+
+// Battery API
+if (navigator.getBattery) {
+    navigator.getBattery = () => Promise.resolve({
+        charging: true,
+        chargingTime: 0,
+        dischargingTime: Infinity,
+        level: 1,
+    });
+}
+
+// Hide automation in console
+const originalLog = console.log;
+console.log = function(...args) {
+    if (args.some(arg => typeof arg === 'string' && 
+        (arg.includes('webdriver') || arg.includes('automation')))) {
+        return;
+    }
+    originalLog.apply(console, args);
+};
+})();
+""")}
+
+
+# Static Chrome switches shared by every driver; create_driver only appends the
+# per-launch ones (profile, headless, window size)
+_STATIC_CHROME_ARGS = (
+    # Basic stealth options
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+
+    # Enhanced anti-detection
+    "--disable-automation",
+    "--disable-web-security",
+    "--disable-features=VizDisplayCompositor",
+    "--no-first-run",
+    "--disable-default-apps",
+    "--disable-extensions-file-access-check",
+    "--disable-extensions-http-throttling",
+    "--disable-ipc-flooding-protection",
+    "--disable-popup-blocking",
+    "--disable-prompt-on-repost",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-features=TranslateUI",
+    "--disable-component-extensions-with-background-pages",
+
+    # Language and locale
+    "--lang=en-US",
+    "--accept-lang=en-US,en;q=0.9",
+)
+
+# CAs known to be in this machine's trust store, by file SHA-256, so steady-state
+# launches skip the certutil/security probe altogether
+_CACHE_DIR = Path.home() / ".cache" / "brightdata_proxy"
+_INSTALLED_CAS_FILE = _CACHE_DIR / "installed.json"
+# Detected Chrome major version per binary (see _detect_chrome_major_version)
+_CHROME_MAJOR_FILE = _CACHE_DIR / "chrome_major.json"
+
+
+def _cert_fingerprint(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@contextmanager
+def _cache_lock():
+    """Exclusive lock on the cache dir so concurrent workers don't clobber its files"""
+    _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(_CACHE_DIR / ".lock", "a+b") as fh:
+        if _SYSTEM == "windows":
+            import msvcrt
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _update_json(path: Path, key: str, value):
+    """Set one key in a cache file (locked read-modify-write, atomic replace)"""
+    try:
+        with _cache_lock():
+            data = _read_json(path)
+            data[key] = value
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, path)
+    except OSError as e:
+        print(f"[WARN] Could not update {path}: {e}")
+
+
+# Mobile emulation CDP params (Pixel 6 Pro), shared by every driver
+_MOBILE_METRICS = {"width": 412, "height": 915, "deviceScaleFactor": 3.5, "mobile": True}
+_MOBILE_TOUCH = {"enabled": True, "maxTouchPoints": 5}
+# Android Chrome UA - matches Chrome browser better than iOS Safari
+_MOBILE_UA = {
+    "userAgent": (
+        "Mozilla/5.0 (Linux; Android 14; Pixel 6 Pro) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/139.0.0.0 Mobile Safari/537.36"
+    )
+}
+
+
+# Warm profiles reused across runs when BRIGHTDATA_REUSE_PROFILE=1
+_PROFILE_POOL_DIR = Path(tempfile.gettempdir()) / "brightdata_profiles"
+_PROFILE_LOCK_FILES = ("SingletonLock", "lockfile")
+_MIN_SHM_FREE = 512 * 1024 * 1024  # keep per-launch profiles off a small /dev/shm
+# Throwaway per-launch profiles live in a directory of their own (RAM-backed where possible,
+# else beside this script), so the stale-profile sweep only ever looks inside it
+_LAUNCH_PROFILES = "brightdata_launch_profiles"
+_STALE_PROFILE_AGE = 300  # seconds; younger unlocked profiles may still be starting Chrome
+
+
 class BrowserSetup:
     """Handles browser initialization with optional mobile emulation and proxy"""
 
+    # Per-process CA state keyed by cert path: {"exists", "installed"},
+    # so later create_driver calls skip the stat/env lookups and trust-store probes
+    _cert_state: dict = {}
+
     def __init__(self, headless: bool = True, mobile: bool = True):
         self.headless = headless
         self.mobile = mobile
         self.script_dir = Path(__file__).resolve().parent
         self.bd_cert_file = self.script_dir / "brightdata_ca.crt"
         self.sw_cert_file = self.script_dir / "seleniumwire_ca.crt"
-        self.profile_dir = self.script_dir / f"chrome_profile_{int(time.time())}"
-        self.proxy = os.getenv("BRIGHTDATA_PROXY")
+        self.profile_dir = self._pick_profile_dir()
+        self.proxy = _ENV.proxy
 
         if not self.proxy:
             self._die("BRIGHTDATA_PROXY not set in .env or environment")
@@ -54,22 +366,135 @@ class BrowserSetup:
         print(f"[ERROR] {msg}")
         sys.exit(code)
 
+    # ---------------------------
+    # Profile directories
+    # ---------------------------
+
+    @staticmethod
+    def _profile_in_use(path: Path) -> bool:
+        """Chrome holds SingletonLock (POSIX) or lockfile (Windows) while a profile is open"""
+        return any(os.path.lexists(path / name) for name in _PROFILE_LOCK_FILES)
+
+    def _pick_profile_dir(self) -> Path:
+        """
+        Default: a throwaway per-launch profile, removed at exit.
+        BRIGHTDATA_REUSE_PROFILE=1: reuse the warm pool profile so Chrome skips cold
+        profile init; if it's busy, clone the warm template instead of starting empty.
+        """
+        self._sweep_launch_profiles()
+
+        if not _ENV.reuse_profile:
+            parent = self._ram_profile_parent() or self.script_dir / _LAUNCH_PROFILES
+            parent.mkdir(parents=True, exist_ok=True)
+            profile = Path(tempfile.mkdtemp(prefix="profile_", dir=parent))
+            atexit.register(shutil.rmtree, profile, ignore_errors=True)
+            return profile
+
+        _PROFILE_POOL_DIR.mkdir(parents=True, exist_ok=True)
+        warm = _PROFILE_POOL_DIR / "warm_0"
+        if not self._profile_in_use(warm):
+            return warm
+
+        profile = Path(tempfile.mkdtemp(prefix="warm_", dir=_PROFILE_POOL_DIR))
+        template = _PROFILE_POOL_DIR / "warm_template"
+        if template.is_dir():
+            shutil.copytree(template, profile, dirs_exist_ok=True)
+        atexit.register(shutil.rmtree, profile, ignore_errors=True)
+        return profile
+
+    def _sweep_launch_profiles(self):
+        """Remove per-launch profiles left by earlier runs (e.g. after a crash) that nothing has open"""
+        parents = [self.script_dir / _LAUNCH_PROFILES]
+        if _SYSTEM == "linux":
+            parents.append(Path("/dev/shm") / _LAUNCH_PROFILES)
+
+        cutoff = time.time() - _STALE_PROFILE_AGE
+        for parent in parents:
+            try:
+                candidates = list(parent.iterdir())
+            except OSError:
+                continue
+            for stale in candidates:
+                try:
+                    if stale.stat().st_mtime > cutoff or self._profile_in_use(stale):
+                        continue
+                except OSError:
+                    continue
+                shutil.rmtree(stale, ignore_errors=True)
+
+    @staticmethod
+    def _ram_profile_parent() -> Optional[Path]:
+        """
+        Memory-backed home for throwaway profiles, so Chrome's profile-init writes
+        never hit disk: /dev/shm on Linux (if writable with room to spare - Docker
+        defaults it to 64 MB). None elsewhere - macOS has no tmpfs ($TMPDIR is on disk).
+        """
+        if _SYSTEM == "linux":
+            shm = Path("/dev/shm")
+            try:
+                if os.access(shm, os.W_OK) and shutil.disk_usage(shm).free >= _MIN_SHM_FREE:
+                    return shm / _LAUNCH_PROFILES
+            except OSError:
+                pass
+        return None
+
+    def _snapshot_warm_profile(self):
+        """After the first good launch from warm_0, keep a copy for busy-pool clones"""
+        template = _PROFILE_POOL_DIR / "warm_template"
+        if not _ENV.reuse_profile or template.exists() or self.profile_dir.name != "warm_0":
+            return
+        try:
+            shutil.copytree(self.profile_dir, template,
+                            ignore=shutil.ignore_patterns("Singleton*", "lockfile"))
+        except Exception as e:
+            print(f"[WARN] Could not snapshot warm profile: {e}")
+            shutil.rmtree(template, ignore_errors=True)
+
     # ---------------------------
     # Certificates
     # ---------------------------
 
+    def _already_trusted(self, cert_file: Path, state: dict) -> bool:
+        """True if this process or an earlier run already confirmed the CA is trusted"""
+        if state["installed"]:
+            return True
+        if _cert_fingerprint(cert_file) in _read_json(_INSTALLED_CAS_FILE):
+            state["installed"] = True
+            return True
+        return False
+
+    def _record_trusted(self, cert_file: Path, state: dict):
+        """Mark the CA trusted for this process and in the on-disk cache"""
+        state["installed"] = True
+        _update_json(_INSTALLED_CAS_FILE, _cert_fingerprint(cert_file), True)
+
+    def _cert_entry(self, path: Path) -> dict:
+        """Cached state for a cert file (stat'ed only on first use)"""
+        state = BrowserSetup._cert_state.get(path)
+        if state is None:
+            # One stat; an empty file (e.g. an interrupted write) counts as missing
+            try:
+                exists = os.stat(path).st_size > 0
+            except FileNotFoundError:
+                exists = False
+            state = {"exists": exists, "installed": None}
+            BrowserSetup._cert_state[path] = state
+        return state
+
     def _write_cert_from_env(self, path: Path, b64_env: str, pem_env: str, label: str) -> bool:
         """Write certificate from environment variables"""
-        if path.exists():
+        state = self._cert_entry(path)
+        if state["exists"]:
             return False
 
-        b64 = os.getenv(b64_env)
-        pem = os.getenv(pem_env)
+        b64 = _ENV.ca.get(b64_env)
+        pem = _ENV.ca.get(pem_env)
 
         if b64:
             import base64
             try:
                 path.write_bytes(base64.b64decode(b64))
+                state["exists"] = True
                 print(f"[INFO] Wrote {label} from {b64_env} to: {path}")
                 return True
             except Exception as e:
@@ -78,6 +503,7 @@ class BrowserSetup:
         if pem:
             try:
                 path.write_text(pem, encoding="utf-8")
+                state["exists"] = True
                 print(f"[INFO] Wrote {label} from {pem_env} to: {path}")
                 return True
             except Exception as e:
@@ -91,39 +517,51 @@ class BrowserSetup:
         self._write_cert_from_env(
             self.bd_cert_file, "BRIGHTDATA_CA_B64", "BRIGHTDATA_CA_PEM", "Bright Data CA"
         )
-        if not self.bd_cert_file.exists():
+        if not self._cert_entry(self.bd_cert_file)["exists"]:
             self._die(f"Bright Data CA not found. Set BRIGHTDATA_CA_B64/PEM or place: {self.bd_cert_file}")
 
         # Selenium-Wire CA
         self._write_cert_from_env(
             self.sw_cert_file, "SELENIUMWIRE_CA_B64", "SELENIUMWIRE_CA_PEM", "Selenium-Wire CA"
         )
-        if not self.sw_cert_file.exists():
+        if not self._cert_entry(self.sw_cert_file)["exists"]:
             print("[INFO] Extracting Selenium-Wire CA...")
+            # The root cert ships inside the already-imported seleniumwire package;
+            # read it in-process instead of starting `python -m seleniumwire extractcert`
+            try:
+                import pkgutil
+                ca_bytes = pkgutil.get_data("seleniumwire", "ca.crt")
+            except Exception:
+                ca_bytes = None
+            if ca_bytes:
+                self.sw_cert_file.write_bytes(ca_bytes)
+                self._cert_entry(self.sw_cert_file)["exists"] = True
+                print(f"[INFO] Saved Selenium-Wire CA to: {self.sw_cert_file}")
+                return
+
             try:
                 subprocess.run([sys.executable, "-m", "seleniumwire", "extractcert"],
                                check=True, cwd=str(self.script_dir))
                 ca_in_cwd = self.script_dir / "ca.crt"
                 if ca_in_cwd.exists():
                     ca_in_cwd.replace(self.sw_cert_file)
+                    self._cert_entry(self.sw_cert_file)["exists"] = True
                     print(f"[INFO] Saved Selenium-Wire CA to: {self.sw_cert_file}")
                 else:
                     self._die("Could not find extracted Selenium-Wire CA")
             except subprocess.CalledProcessError as e:
                 self._die(f"Failed to extract Selenium-Wire CA: {e}")
 
+    def _prepare_certs(self):
+        """Ensure CA files exist, then trust them"""
+        self._ensure_certificates()
+        self._install_certificates()
+
     def _install_certificates(self):
         """Install certificates to system trust store (platform-specific)"""
-        system = platform.system().lower()
-
-        if system == "linux":
-            self._install_linux_certs()
-        elif system == "darwin":
-            self._install_macos_certs()
-        elif system == "windows":
-            self._install_windows_certs()
-        else:
-            self._die(f"Unsupported OS for certificate installation: {system}")
+        if _INSTALL_CERTS_FN is None:
+            self._die(f"Unsupported OS for certificate installation: {_SYSTEM}")
+        _INSTALL_CERTS_FN(self)
 
     def _install_linux_certs(self):
         """Install certificates on Linux using NSS"""
@@ -132,6 +570,9 @@ class BrowserSetup:
 
         for cert_file, cert_name in [(self.bd_cert_file, "Bright Data"),
                                      (self.sw_cert_file, "Selenium Wire")]:
+            state = self._cert_entry(cert_file)
+            if self._already_trusted(cert_file, state):
+                continue
             try:
                 output = subprocess.check_output(
                     ["certutil", "-d", f"sql:{nssdb}", "-L"],
@@ -145,8 +586,10 @@ class BrowserSetup:
                         check=True
                     )
                     print(f"[INFO] Installed {cert_name} CA into NSS DB")
+                    self._record_trusted(cert_file, state)
                 else:
                     print(f"[INFO] {cert_name} CA already in NSS DB")
+                    self._record_trusted(cert_file, state)
             except FileNotFoundError:
                 self._die("certutil not found. Install: sudo apt-get install libnss3-tools")
 
@@ -154,6 +597,9 @@ class BrowserSetup:
         """Install certificates on macOS"""
         for cert_file, cert_name in [(self.bd_cert_file, "Bright Data"),
                                      (self.sw_cert_file, "Selenium Wire")]:
+            state = self._cert_entry(cert_file)
+            if self._already_trusted(cert_file, state):
+                continue
             try:
                 output = subprocess.check_output(
                     ["security", "find-certificate", "-a", "-c", cert_name,
@@ -169,29 +615,41 @@ class BrowserSetup:
                         check=True
                     )
                     print(f"[INFO] Installed {cert_name} CA into macOS Keychain")
+                    self._record_trusted(cert_file, state)
                 else:
                     print(f"[INFO] {cert_name} CA already in macOS Keychain")
+                    self._record_trusted(cert_file, state)
             except Exception as e:
                 print(f"[WARN] Could not install {cert_name} CA: {e}")
 
     def _install_windows_certs(self):
         """Install certificates on Windows"""
+        # certutil.exe is run directly (no cmd.exe via shell=True), and the Root store
+        # is listed at most once for both CAs
+        certutil = shutil.which("certutil") or "certutil"
+        store_output = None
         for cert_file, cert_name in [(self.bd_cert_file, "Bright Data"),
                                      (self.sw_cert_file, "Selenium Wire")]:
+            state = self._cert_entry(cert_file)
+            if self._already_trusted(cert_file, state):
+                continue
             try:
-                output = subprocess.check_output(
-                    ["certutil", "-user", "-store", "Root"],
-                    stderr=subprocess.DEVNULL, shell=True
-                ).decode("utf-8", "ignore")
+                if store_output is None:
+                    store_output = subprocess.check_output(
+                        [certutil, "-user", "-store", "Root"],
+                        stderr=subprocess.DEVNULL
+                    ).decode("utf-8", "ignore").lower()
 
-                if cert_name.lower() not in output.lower():
+                if cert_name.lower() not in store_output:
                     subprocess.run(
-                        ["certutil", "-user", "-addstore", "-f", "Root", str(cert_file)],
-                        check=True, shell=True
+                        [certutil, "-user", "-addstore", "-f", "Root", str(cert_file)],
+                        check=True
                     )
                     print(f"[INFO] Installed {cert_name} CA into Windows Store")
+                    self._record_trusted(cert_file, state)
                 else:
                     print(f"[INFO] {cert_name} CA already in Windows Store")
+                    self._record_trusted(cert_file, state)
             except Exception as e:
                 print(f"[WARN] Could not install {cert_name} CA: {e}")
 
@@ -200,34 +658,27 @@ class BrowserSetup:
     # ---------------------------
 
     def _find_chrome_binary(self) -> Optional[str]:
-        """Find the Chrome binary. CHROME_PATH can override."""
-        env_path = os.getenv("CHROME_PATH")
+        """Find the Chrome binary (probed once per process). CHROME_PATH can override."""
+        global _CHROME_BIN_CACHE
+        if _CHROME_BIN_CACHE is _MISSING:
+            _CHROME_BIN_CACHE = self._probe_chrome_binary()
+        return _CHROME_BIN_CACHE
+
+    def _probe_chrome_binary(self) -> Optional[str]:
+        env_path = _ENV.chrome_path
         if env_path and Path(env_path).exists():
             return env_path
 
-        system = platform.system().lower()
-        candidates = []
-
-        if system == "windows":
-            candidates.extend([
-                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            ])
-        elif system == "darwin":
-            candidates.extend([
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-            ])
-        else:  # linux
-            candidates.extend([
-                shutil.which("google-chrome"),
-                shutil.which("google-chrome-stable"),
-                shutil.which("chrome"),
-                shutil.which("chromium"),
-                shutil.which("chromium-browser"),
-            ])
-
-        for p in candidates:
-            if p and Path(p).exists():
+        if _SYSTEM not in ("windows", "darwin"):
+            # One PATH walk per name, stopping at the first hit
+            for name in _CHROME_CANDIDATES:
+                found = shutil.which(name)
+                if found:
+                    return found
+            return None
+
+        for p in _CHROME_CANDIDATES:
+            if Path(p).exists():
                 return p
 
         # last resort: PATH lookup
@@ -235,26 +686,52 @@ class BrowserSetup:
         return which_any
 
     def _chrome_major_version(self) -> Optional[int]:
-        """Return installed Chrome major version, or None if unknown. CHROME_VERSION_MAIN can override."""
-        override = os.getenv("CHROME_VERSION_MAIN")
-        if override and override.isdigit():
-            try:
-                return int(override)
-            except ValueError:
-                pass
+        """Return installed Chrome major version, or None if unknown (detected once per process). CHROME_VERSION_MAIN can override."""
+        global _CHROME_VER_CACHE
+        if _CHROME_VER_CACHE is _MISSING:
+            _CHROME_VER_CACHE = self._detect_chrome_major_version()
+        return _CHROME_VER_CACHE
+
+    def _detect_chrome_major_version(self) -> Optional[int]:
+        if _ENV.chrome_version_main:
+            return _ENV.chrome_version_main
 
         chrome_bin = self._find_chrome_binary()
         if not chrome_bin:
             print("[WARN] Could not locate Chrome binary to detect version.")
             return None
 
+        # Keyed by the binary's mtime+size, so a Chrome update invalidates the entry
+        try:
+            st = os.stat(chrome_bin)
+            key = hashlib.sha256(f"{chrome_bin}:{st.st_mtime_ns}:{st.st_size}".encode()).hexdigest()
+        except OSError:
+            key = None
+        if key:
+            cached = _read_json(_CHROME_MAJOR_FILE).get(key)
+            if cached:
+                print(f"[INFO] Detected Chrome major version: {cached} (cached)")
+                return cached
+
+        major = self._probe_chrome_major_version(chrome_bin)
+        if major and key:
+            _update_json(_CHROME_MAJOR_FILE, key, major)
+        return major
+
+    def _probe_chrome_major_version(self, chrome_bin: str) -> Optional[int]:
+        major = self._chrome_version_from_metadata(chrome_bin)
+        if major:
+            print(f"[INFO] Detected Chrome major version: {major}")
+            return major
+
+        # Fallback: ask the browser itself (fork+exec, so only when metadata is unreadable)
         try:
             out = subprocess.check_output([chrome_bin, "--version"], text=True, stderr=subprocess.STDOUT)
             # Examples:
             # Windows: "Google Chrome 138.0.7204.184"
             # macOS:   "Google Chrome 138.0.###"
             # Linux:   "Google Chrome 138.0.###"
-            m = re.search(r"(\d+)\.", out)
+            m = _CHROME_VER_RE.search(out)
             major = int(m.group(1)) if m else None
             if major:
                 print(f"[INFO] Detected Chrome major version: {major}")
@@ -265,180 +742,33 @@ class BrowserSetup:
             print(f"[WARN] Failed to query Chrome version: {e}")
             return None
 
+    def _chrome_version_from_metadata(self, chrome_bin: str) -> Optional[int]:
+        """Read Chrome's major version from files next to the binary, without running it"""
+        try:
+            path = Path(chrome_bin).resolve()
+            if _SYSTEM == "darwin":
+                # .../Google Chrome.app/Contents/MacOS/Google Chrome -> Contents/Info.plist
+                import plistlib
+                with open(path.parents[1] / "Info.plist", "rb") as f:
+                    version = plistlib.load(f)["CFBundleShortVersionString"]
+            elif _SYSTEM == "windows":
+                # The installer keeps the versioned payload in Application\<version>\
+                versions = [d.name for d in path.parent.iterdir()
+                            if d.is_dir() and _CHROME_VER_DIR_RE.fullmatch(d.name)]
+                version = max(versions, key=lambda v: tuple(map(int, v.split("."))))
+            else:
+                version = (path.parent / "VERSION").read_text().strip()
+            return int(version.split(".")[0])
+        except Exception:
+            return None
+
     def _setup_page_stealth(self, driver):
-        """Set up automatic stealth application on new pages"""
+        """Apply the stealth patches to every new document via CDP"""
         try:
-            # Use CDP to apply stealth on every page load
-            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-                "source": """
-                    // Auto-apply stealth on page load
-                    if (!window.__stealthApplied) {
-                        window.__stealthApplied = true;
-                        
-                        // Override webdriver
-                        Object.defineProperty(navigator, 'webdriver', {
-                            get: () => false,
-                            configurable: false
-                        });
-                        
-                        // Hide automation
-                        if (window.chrome) {
-                            window.chrome.runtime = undefined;
-                        }
-                    }
-                """
-            })
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", _STEALTH_ON_NEW_DOC)
             print("[INFO] Set up automatic stealth on page navigation")
         except Exception as e:
             print(f"[WARN] Could not set up page stealth: {e}")
-    
-    # ---------------------------
-    # Stealth JavaScript patches
-    # ---------------------------
-    
-    def _apply_stealth_scripts(self, driver):
-        """Apply JavaScript patches to hide automation traces"""
-        
-        # Enhanced stealth with proper plugin emulation
-        stealth_js = """
-        // Check if already applied
-        if (window.__stealthApplied) {
-            return 'Stealth already applied';
-        }
-        window.__stealthApplied = true;
-        
-        // Remove webdriver property (with check)
-        try {
-            if (navigator.webdriver !== false) {
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => false,
-                });
-            }
-        } catch (e) {
-            // Property already defined
-        }
-        
-        // Realistic plugins array
-        const pluginData = [
-            {name: 'PDF Viewer', filename: 'internal-pdf-viewer', description: 'Portable Document Format'},
-            {name: 'Chrome PDF Viewer', filename: 'internal-pdf-viewer', description: 'Portable Document Format'},
-            {name: 'Chromium PDF Viewer', filename: 'internal-pdf-viewer', description: 'Portable Document Format'},
-            {name: 'Microsoft Edge PDF Viewer', filename: 'internal-pdf-viewer', description: 'Portable Document Format'},
-            {name: 'WebKit built-in PDF', filename: 'internal-pdf-viewer', description: 'Portable Document Format'}
-        ];
-        
-        const plugins = pluginData.map(p => {
-            const plugin = {};
-            plugin.name = p.name;
-            plugin.filename = p.filename;
-            plugin.description = p.description;
-            plugin.length = 1;
-            plugin[0] = {
-                type: 'application/pdf',
-                suffixes: 'pdf',
-                description: 'Portable Document Format'
-            };
-            return plugin;
-        });
-        
-        try {
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => plugins,
-            });
-        } catch (e) {}
-        
-        // Proper languages
-        try {
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en'],
-            });
-        } catch (e) {}
-        
-        try {
-            Object.defineProperty(navigator, 'language', {
-                get: () => 'en-US',
-            });
-        } catch (e) {}
-        
-        // Hide chrome automation
-        if (window.chrome) {
-            window.chrome.runtime = undefined;
-            window.chrome.loadTimes = function() {};
-            window.chrome.csi = function() {};
-        }
-        
-        // Override permissions
-        if (navigator.permissions && navigator.permissions.query) {
-            const originalQuery = navigator.permissions.query;
-            navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                    Promise.resolve({ state: Notification.permission }) :
-                    originalQuery(parameters)
-            );
-        }
-        
-        // Realistic screen properties
-        try {
-            Object.defineProperty(screen, 'availWidth', {
-                get: () => screen.width,
-            });
-        } catch (e) {}
-        
-        try {
-            Object.defineProperty(screen, 'availHeight', {
-                get: () => screen.height - 40,
-            });
-        } catch (e) {}
-        
-        // WebGL Vendor and Renderer
-        const getParameter = WebGLRenderingContext.prototype.getParameter;
-        WebGLRenderingContext.prototype.getParameter = function(parameter) {
-            if (parameter === 37445) {
-                return 'Intel Inc.';
-            }
-            if (parameter === 37446) {
-                return 'Intel Iris OpenGL Engine';
-            }
-            return getParameter.apply(this, arguments);
-        };
-        
-        const getParameter2 = WebGL2RenderingContext.prototype.getParameter;
-        WebGL2RenderingContext.prototype.getParameter = function(parameter) {
-            if (parameter === 37445) {
-                return 'Intel Inc.';
-            }
-            if (parameter === 37446) {
-                return 'Intel Iris OpenGL Engine';
-            }
-            return getParameter2.apply(this, arguments);
-        };
-        
-        // Battery API
-        if (navigator.getBattery) {
-            navigator.getBattery = () => Promise.resolve({
-                charging: true,
-                chargingTime: 0,
-                dischargingTime: Infinity,
-                level: 1,
-            });
-        }
-        
-        // Hide automation in console
-        const originalLog = console.log;
-        console.log = function(...args) {
-            if (args.some(arg => typeof arg === 'string' && 
-                (arg.includes('webdriver') || arg.includes('automation')))) {
-                return;
-            }
-            originalLog.apply(console, args);
-        };
-        """
-        
-        try:
-            driver.execute_script(stealth_js)
-            print("[INFO] Applied enhanced stealth JavaScript patches")
-        except Exception as e:
-            print(f"[WARN] Could not apply stealth scripts: {e}")
 
     # ---------------------------
     # Mobile emulation (CDP)
@@ -449,37 +779,18 @@ class BrowserSetup:
         Apply mobile emulation via CDP after browser launch.
         Emulates Android Chrome mobile for better consistency.
         """
-        # Pixel 6 Pro dimensions
-        width, height, dpr = 412, 915, 3.5
-        # Android Chrome UA - matches Chrome browser better than iOS Safari
-        ua = (
-            "Mozilla/5.0 (Linux; Android 14; Pixel 6 Pro) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/139.0.0.0 Mobile Safari/537.36"
-        )
-
         # Resize window (best-effort) for non-headless; not critical in headless.
         try:
-            driver.set_window_size(width, height)
+            driver.set_window_size(_MOBILE_METRICS["width"], _MOBILE_METRICS["height"])
         except Exception:
             pass
 
         # Device metrics & touch emulation
-        driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
-            "width": width,
-            "height": height,
-            "deviceScaleFactor": dpr,
-            "mobile": True
-        })
-        driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {
-            "enabled": True,
-            "maxTouchPoints": 5
-        })
+        driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", _MOBILE_METRICS)
+        driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", _MOBILE_TOUCH)
 
         # User-Agent override
-        driver.execute_cdp_cmd("Network.setUserAgentOverride", {
-            "userAgent": ua
-        })
+        driver.execute_cdp_cmd("Network.setUserAgentOverride", _MOBILE_UA)
 
     # ---------------------------
     # Driver creation
@@ -488,9 +799,13 @@ class BrowserSetup:
     def create_driver(self) -> uc.Chrome:
         """Create and configure Chrome driver with optional mobile emulation"""
 
-        # Ensure certificates are ready
-        self._ensure_certificates()
-        self._install_certificates()
+        # Cert prep (files + trust store) and Chrome version detection touch disjoint
+        # resources and are both subprocess/IO bound, so run them side by side
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            f_certs = ex.submit(self._prepare_certs)
+            f_ver = ex.submit(self._chrome_major_version)
+            f_certs.result()
+            vmain = f_ver.result()
 
         # Selenium-wire proxy options
         seleniumwire_options = {
@@ -507,33 +822,8 @@ class BrowserSetup:
         # Chrome options with enhanced stealth
         chrome_options = uc.ChromeOptions()
         chrome_options.add_argument(f"--user-data-dir={str(self.profile_dir)}")
-        
-        # Basic stealth options
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        
-        # Enhanced anti-detection
-        chrome_options.add_argument("--disable-automation")
-        chrome_options.add_argument("--disable-web-security")
-        chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-        chrome_options.add_argument("--no-first-run")
-        chrome_options.add_argument("--disable-default-apps")
-        chrome_options.add_argument("--disable-extensions-file-access-check")
-        chrome_options.add_argument("--disable-extensions-http-throttling")
-        chrome_options.add_argument("--disable-ipc-flooding-protection")
-        chrome_options.add_argument("--disable-popup-blocking")
-        chrome_options.add_argument("--disable-prompt-on-repost")
-        chrome_options.add_argument("--disable-renderer-backgrounding")
-        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-        chrome_options.add_argument("--disable-features=TranslateUI")
-        chrome_options.add_argument("--disable-component-extensions-with-background-pages")
-        
-        # Language and locale
-        chrome_options.add_argument("--lang=en-US")
-        chrome_options.add_argument("--accept-lang=en-US,en;q=0.9")
-        
+        chrome_options.arguments.extend(_STATIC_CHROME_ARGS)
+
         # Preferences to hide automation
         prefs = {
             "profile.default_content_setting_values": {
@@ -578,7 +868,6 @@ class BrowserSetup:
         print(f"[INFO] Profile: {self.profile_dir}")
 
         # Pin driver to installed Chrome's major version if we can detect it
-        vmain = self._chrome_major_version()
         kwargs = {
             "options": chrome_options,
             "seleniumwire_options": seleniumwire_options,
@@ -589,9 +878,6 @@ class BrowserSetup:
         # Create driver
         driver = uc.Chrome(**kwargs)
 
-        # Apply stealth JavaScript patches
-        self._apply_stealth_scripts(driver)
-        
         # Set up automatic stealth application on navigation
         self._setup_page_stealth(driver)
 
@@ -599,8 +885,13 @@ class BrowserSetup:
         if self.mobile:
             self._apply_mobile_emulation(driver)
 
+        # Fixed for the driver's lifetime; kept on it so callers needn't ask the page
+        driver.user_agent = (_MOBILE_UA["userAgent"] if self.mobile
+                             else driver.execute_script("return navigator.userAgent;"))
+
         # Verify proxy is working
         self._verify_proxy(driver)
+        self._snapshot_warm_profile()
 
         return driver
 
@@ -609,13 +900,26 @@ class BrowserSetup:
     # ---------------------------
 
     def _verify_proxy(self, driver):
-        """Verify proxy connection is working"""
+        """
+        Verify proxy connection is working. Asks ipify directly through the proxy
+        rather than loading it in the browser ('driver' kept for API compatibility).
+        """
+        import ssl
+        import urllib.request
+
         print("\n" + "=" * 60)
         print("[INFO] Verifying proxy connection...")
 
         try:
-            driver.get("https://api.ipify.org?format=text")
-            ip_addr = driver.find_element("tag name", "body").text.strip()
+            # System roots plus the Bright Data CA, which signs proxied HTTPS
+            ctx = ssl.create_default_context()
+            ctx.load_verify_locations(cafile=str(self.bd_cert_file))
+            opener = urllib.request.build_opener(
+                urllib.request.ProxyHandler({"http": self.proxy, "https": self.proxy}),
+                urllib.request.HTTPSHandler(context=ctx),
+            )
+            with opener.open("https://api.ipify.org?format=text", timeout=10) as resp:
+                ip_addr = resp.read().decode("utf-8", "ignore").strip()
             print(f"[PROXY CHECK] Current IP: {ip_addr}")
 
             if not ip_addr:
@@ -628,6 +932,14 @@ class BrowserSetup:
             self._die(f"Proxy verification failed: {e}")
 
 
+# Trust-store installer for this OS, picked once at import
+_INSTALL_CERTS_FN = {
+    "linux": BrowserSetup._install_linux_certs,
+    "darwin": BrowserSetup._install_macos_certs,
+    "windows": BrowserSetup._install_windows_certs,
+}.get(_SYSTEM)
+
+
 def create_browser(headless: bool = False, mobile: bool = True) -> uc.Chrome:
     """Convenience function to create a browser instance"""
     setup = BrowserSetup(headless=headless, mobile=mobile)
@@ -5,18 +5,121 @@ import requests
 import socket
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime
+import atexit
+import argparse
+import functools
+import hashlib
+import time
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+
+# orjson parses the probe responses faster when installed; stdlib json otherwise
+try:
+    import orjson
+    json_loads, JSONDecodeError = orjson.loads, orjson.JSONDecodeError
+except ImportError:
+    json_loads, JSONDecodeError = json.loads, json.JSONDecodeError
+
+# One keep-alive connection pool for every probe, so hosts queried more than
+# once (httpbin.org) skip a fresh TCP + TLS handshake
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+atexit.register(SESSION.close)
+
+# Short-lived on-disk cache of probe responses, so reruns within a debugging
+# session don't re-query every service (kept short: the point is spotting drift)
+CACHE_DIR = Path.home() / ".cache" / "detect_real_ip"
+CACHE_TTL = 60  # seconds
+USE_CACHE = True  # main() turns this off for --no-cache
+
+# Per-request (connect, read) timeouts, and the overall budget for the source fan-out
+PROBE_TIMEOUT = (3, 7)  # seconds
+PROBE_DEADLINE = 8  # seconds
+
+# Process-wide DNS cache shared by every connection the Session opens: the probe
+# hosts (httpbin.org in particular) are looked up once instead of on each new
+# connection; main() installs it over socket.getaddrinfo
+DNS_TTL = 300  # seconds
+_system_getaddrinfo = socket.getaddrinfo
+_dns_cache = {}  # (host, port, family, type, proto, flags) -> (resolved_at, addrinfo list)
+
+def cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """socket.getaddrinfo, reusing successful answers for DNS_TTL seconds"""
+    key = (host, port, family, type, proto, flags)
+    hit = _dns_cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < DNS_TTL:
+        return hit[1]
+    result = _system_getaddrinfo(host, port, family, type, proto, flags)
+    _dns_cache[key] = (time.monotonic(), result)
+    return result
+
+def ttl_cached(ttl):
+    """Cache successful (status, text) results of fn(url) on disk for `ttl` seconds"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(url):
+            path = CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+            if USE_CACHE:
+                try:
+                    entry = json.loads(path.read_text(encoding="utf-8"))
+                    if entry["expires_at"] > time.time():
+                        return entry["status"], entry["content"]
+                except (OSError, ValueError, KeyError):
+                    pass
+            status, content = fn(url)
+            if status == 200:
+                try:
+                    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    path.write_text(json.dumps({
+                        "expires_at": time.time() + ttl, "status": status, "content": content,
+                    }), encoding="utf-8")
+                except OSError:
+                    pass
+            return status, content
+        return wrapper
+    return decorator
+
+@ttl_cached(CACHE_TTL)
+def http_get(url):
+    """GET through the shared session; returns (status_code, text)"""
+    response = SESSION.get(url, timeout=PROBE_TIMEOUT)
+    return response.status_code, response.text
+
+def fetch_ip(url, ip_field):
+    """Fetch one source; returns (ip, None) on success or (None, failure reason)
+
+    ip_field names the JSON key holding the IP, or is None for plain-text sources.
+    """
+    try:
+        status, text = http_get(url)
+        if status != 200:
+            return None, f"HTTP {status}"
+        
+        if ip_field is None:
+            return text.strip(), None
+        return json_loads(text)[ip_field], None
+    
+    except requests.exceptions.RequestException as e:
+        return None, f"{str(e)[:50]}..."
+    except (JSONDecodeError, KeyError, TypeError):
+        return None, f"unexpected response (no '{ip_field}' field)"
+    except Exception as e:
+        return None, f"{str(e)[:50]}..."
 
 def get_ip_from_multiple_sources():
     """Get IP address from multiple sources to see variations"""
     
+    # (name, url, JSON key holding the IP or None for a plain-text body)
     sources = [
-        ("httpbin.org", "http://httpbin.org/ip"),
-        ("ipify.org", "https://api.ipify.org?format=json"),
-        ("ip-api.com", "http://ip-api.com/json/"),
-        ("ipinfo.io", "https://ipinfo.io/json"),
-        ("whatismyip.akamai.com", "http://whatismyip.akamai.com/"),
-        ("icanhazip.com", "https://icanhazip.com/"),
+        ("httpbin.org", "http://httpbin.org/ip", "origin"),
+        ("ipify.org", "https://api.ipify.org?format=json", "ip"),
+        ("ip-api.com", "http://ip-api.com/json/", "query"),
+        ("ipinfo.io", "https://ipinfo.io/json", "ip"),
+        ("whatismyip.akamai.com", "http://whatismyip.akamai.com/", None),
+        ("icanhazip.com", "https://icanhazip.com/", None),
     ]
     
     results = {}
@@ -24,36 +127,26 @@ def get_ip_from_multiple_sources():
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
-    for name, url in sources:
+    # Network-bound: query all sources at once, so the total wait is roughly the
+    # slowest single source instead of the sum of all of them
+    pool = ThreadPoolExecutor(max_workers=len(sources))
+    futures = [pool.submit(fetch_ip, url, ip_field) for _, url, ip_field in sources]
+    deadline = time.monotonic() + PROBE_DEADLINE
+    
+    # Report in the fixed source order; anything still running at the deadline is a failure
+    for (name, _, _), future in zip(sources, futures):
         try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                content = response.text.strip()
-                
-                # Try to parse as JSON
-                try:
-                    data = json.loads(content)
-                    if 'origin' in data:
-                        ip = data['origin']
-                    elif 'ip' in data:
-                        ip = data['ip']
-                    elif 'query' in data:
-                        ip = data['query']
-                    else:
-                        ip = content
-                except:
-                    ip = content
-                
-                results[name] = ip
-                print(f"[OK] {name:20}: {ip}")
-            else:
-                print(f"[FAIL] {name:20}: HTTP {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
-            print(f"[FAIL] {name:20}: {str(e)[:50]}...")
-        except Exception as e:
-            print(f"[FAIL] {name:20}: {str(e)[:50]}...")
+            ip, error = future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeout:
+            ip, error = None, f"timeout ({PROBE_DEADLINE}s deadline)"
+        if ip is not None:
+            results[name] = ip
+            print(f"[OK] {name:20}: {ip}")
+        else:
+            print(f"[FAIL] {name:20}: {error}")
     
+    # Don't block on stragglers; their own request timeouts end them
+    pool.shutdown(wait=False)
     return results
 
 def analyze_ip_variations(results):
@@ -107,18 +200,22 @@ def test_oxylabs_specific():
         "http://httpbin.org/ip",   # Non-SSL version
     ]
     
-    for url in oxylabs_test_urls:
-        try:
+    def fetch_origin(url):
+        # Always a fresh request: the source fan-out above already cached these URLs
+        response = SESSION.get(url, timeout=PROBE_TIMEOUT)
+        if response.status_code == 200:
+            data = json_loads(response.text)
+            return f"  Oxylabs-route IP: {data.get('origin', 'unknown')}"
+        return f"  Failed: HTTP {response.status_code}"
+    
+    with ThreadPoolExecutor(max_workers=len(oxylabs_test_urls)) as pool:
+        futures = [pool.submit(fetch_origin, url) for url in oxylabs_test_urls]
+        for url, future in zip(oxylabs_test_urls, futures):
             print(f"Testing {url}...")
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = json.loads(response.text)
-                ip = data.get('origin', 'unknown')
-                print(f"  Oxylabs-route IP: {ip}")
-            else:
-                print(f"  Failed: HTTP {response.status_code}")
-        except Exception as e:
-            print(f"  Error: {e}")
+            try:
+                print(future.result())
+            except Exception as e:
+                print(f"  Error: {e}")
 
 def get_network_info():
     """Get additional network information"""
@@ -131,16 +228,23 @@ def get_network_info():
         local_ip = s.getsockname()[0]
         s.close()
         print(f"Local IP: {local_ip}")
-    except:
+    except OSError:
         print("Could not determine local IP")
     
     try:
         hostname = socket.gethostname()
         print(f"Hostname: {hostname}")
-    except:
+    except OSError:
         pass
 
 def main():
+    global USE_CACHE
+    parser = argparse.ArgumentParser(description="Detect your real IP from multiple sources")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Ignore IP lookups cached in the last {CACHE_TTL}s and query every source")
+    USE_CACHE = not parser.parse_args().no_cache
+    socket.getaddrinfo = cached_getaddrinfo
+    
     print("IP ADDRESS DETECTIVE")
     print("=" * 50)
     print("This tool will help you understand why you see different IPs")
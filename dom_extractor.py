@@ -5,11 +5,156 @@ Extracts interactive elements and important content while minimizing tokens
 
 from typing import Dict, List, Any, Optional
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.common.by import By
+import functools
 import json
 import re
 
 
+# Viewport, scroll position, interactive elements and text in one script call
+_EXTRACT_PAGE_JS = """
+    const SELECTORS = {
+        inputs: 'input, textarea',
+        links: 'a[href]',
+        buttons: 'button, input[type="submit"], input[type="button"], [role="button"]',
+        selects: 'select'
+    };
+    // Search results, headers, articles and paragraphs
+    const TEXT_SELECTORS = ['.g', 'h1', 'h2', 'h3', 'article', 'main', '.result', 'p'];
+    
+    // One query for every candidate, then all geometry reads in a single pass
+    const all = Array.from(document.querySelectorAll(
+        Object.values(SELECTORS).concat(TEXT_SELECTORS).join(', ')));
+    const rects = all.map(el => el.getBoundingClientRect());
+    
+    const box = rect => ({x: rect.x, y: rect.y, width: rect.width, height: rect.height});
+    const inputs = [], links = [], buttons = [], selects = [];
+    const textGroups = TEXT_SELECTORS.map(() => new Set());
+    // Repeated links/buttons (pagination, product grids) are sent once, so the caps keep distinct ones
+    const seenLinks = new Set(), seenButtons = new Set();
+    
+    all.forEach((el, i) => {
+        const rect = rects[i];
+        if (!(rect.width > 0 && rect.height > 0)) return;
+        
+        TEXT_SELECTORS.forEach((selector, group) => {
+            // No group can contribute more than the 10 snippets that are sent back
+            if (textGroups[group].size < 10 && el.matches(selector)) {
+                const trimmed = (el.innerText || el.textContent || '').trim();
+                if (trimmed.length > 20 && trimmed.length < 500) {
+                    textGroups[group].add(trimmed.length > 100 ? trimmed.substring(0, 100) + '...' : trimmed);
+                }
+            }
+        });
+        
+        if (el.offsetParent === null) return;
+        
+        if (el.matches(SELECTORS.inputs) && el.type !== 'hidden') {
+            inputs.push({
+                el: el,
+                tag: el.tagName.toLowerCase(),
+                type: el.type || 'text',
+                name: el.name || '',
+                id: el.id || '',
+                placeholder: el.placeholder || '',
+                value: el.value || '',
+                ariaLabel: el.getAttribute('aria-label') || '',
+                className: el.className || '',
+                rect: box(rect)
+            });
+        }
+        
+        if (el.matches(SELECTORS.links)) {
+            const text = (el.innerText || el.textContent || '').trim();
+            const key = el.href + '|' + text.substring(0, 50);
+            if (text && !seenLinks.has(key)) {
+                seenLinks.add(key);
+                links.push({
+                    el: el,
+                    href: el.href,
+                    text: text.substring(0, 100),
+                    title: el.title || '',
+                    rect: box(rect)
+                });
+            }
+        }
+        
+        if (el.matches(SELECTORS.buttons)) {
+            const text = (el.innerText || el.textContent || el.value || '').trim();
+            const key = text.substring(0, 50) + '|' + (el.getAttribute('aria-label') || '');
+            if ((text || el.type === 'submit') && !seenButtons.has(key)) {
+                seenButtons.add(key);
+                buttons.push({
+                    el: el,
+                    tag: el.tagName.toLowerCase(),
+                    type: el.type || 'button',
+                    text: text.substring(0, 50),
+                    ariaLabel: el.getAttribute('aria-label') || '',
+                    className: el.className || '',
+                    rect: box(rect)
+                });
+            }
+        }
+        
+        if (el.matches(SELECTORS.selects)) {
+            selects.push({
+                el: el,
+                name: el.name || '',
+                id: el.id || '',
+                selectedIndex: el.selectedIndex,
+                options: Array.from(el.options).slice(0, 20).map(opt => ({  // Limit options
+                    value: opt.value,
+                    text: opt.text
+                })),
+                rect: box(rect)
+            });
+        }
+    });
+    const texts = [].concat(...textGroups.map(group => [...group]));
+    
+    const doc = document.documentElement;
+    return {
+        url: location.href,
+        title: document.title,
+        viewport: {
+            width: window.innerWidth,
+            height: window.innerHeight,
+            scrollHeight: doc.scrollHeight,
+            scrollWidth: doc.scrollWidth
+        },
+        scroll: {
+            x: window.pageXOffset || doc.scrollLeft,
+            y: window.pageYOffset || doc.scrollTop
+        },
+        inputs: inputs,
+        links: links.slice(0, 50),  // Limit to 50 most relevant links
+        buttons: buttons.slice(0, 30),  // Limit buttons
+        selects: selects,
+        texts: [...new Set(texts)].slice(0, 10)  // Unique texts, max 10
+    };
+"""
+
+# Checked in order against the lowercased name/id/placeholder/aria-label; first match wins
+_PURPOSE_PATTERNS = [
+    (re.compile(r"search|query"), "search"),
+    (re.compile(r"email"), "email"),
+    (re.compile(r"password"), "password"),
+    (re.compile(r"user|login"), "username"),
+    (re.compile(r"phone|tel"), "phone"),
+]
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify_purpose(combined: str, name: str, input_type: str) -> str:
+    """Purpose of an input from its combined attribute text; memoised across page extractions"""
+    if name == 'q':
+        return "search"
+    
+    purpose = next((purpose for pattern, purpose in _PURPOSE_PATTERNS if pattern.search(combined)), "text")
+    if input_type == 'password' and purpose not in ("search", "email"):
+        return "password"
+    return purpose
+
+
 class DOMExtractor:
     """Extracts and simplifies DOM for AI analysis"""
     
@@ -25,117 +170,42 @@ class DOMExtractor:
         self.element_counter = 0
         self.element_map = {}
         
+        # Everything is read in a single script round trip
+        raw = self.driver.execute_script(_EXTRACT_PAGE_JS)
+        
         page_info = {
-            "url": self.driver.current_url,
-            "title": self.driver.title,
-            "viewport": self._get_viewport_info(),
-            "elements": self._extract_interactive_elements(),
-            "text_content": self._extract_important_text(),
-            "scroll_position": self._get_scroll_position()
+            "url": raw['url'],
+            "title": raw['title'],
+            "viewport": raw['viewport'],
+            "elements": self._extract_interactive_elements(raw),
+            "text_content": raw['texts'],
+            "scroll_position": raw['scroll']
         }
         
         return page_info
     
-    def _get_viewport_info(self) -> Dict[str, int]:
-        """Get viewport dimensions and scroll info"""
-        return self.driver.execute_script("""
-            return {
-                width: window.innerWidth,
-                height: window.innerHeight,
-                scrollHeight: document.documentElement.scrollHeight,
-                scrollWidth: document.documentElement.scrollWidth
-            };
-        """)
-    
-    def _get_scroll_position(self) -> Dict[str, int]:
-        """Get current scroll position"""
-        return self.driver.execute_script("""
-            return {
-                x: window.pageXOffset || document.documentElement.scrollLeft,
-                y: window.pageYOffset || document.documentElement.scrollTop
-            };
-        """)
-    
-    def _extract_interactive_elements(self) -> List[Dict[str, Any]]:
-        """Extract clickable and interactive elements"""
-        elements = []
-        
-        # Extract search boxes and input fields
-        inputs = self._extract_inputs()
-        elements.extend(inputs)
-        
-        # Extract clickable links
-        links = self._extract_links()
-        elements.extend(links)
-        
-        # Extract buttons
-        buttons = self._extract_buttons()
-        elements.extend(buttons)
-        
-        # Extract select dropdowns
-        selects = self._extract_selects()
-        elements.extend(selects)
-        
-        return elements
+    def _extract_interactive_elements(self, raw: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Extract clickable and interactive elements, grouped by type"""
+        return {
+            # Search boxes and input fields
+            "inputs": self._extract_inputs(raw['inputs']),
+            # Clickable links
+            "links": self._extract_links(raw['links']),
+            # Buttons
+            "buttons": self._extract_buttons(raw['buttons']),
+            # Select dropdowns
+            "selects": self._extract_selects(raw['selects'])
+        }
     
-    def _extract_inputs(self) -> List[Dict[str, Any]]:
+    def _extract_inputs(self, input_data: List[Dict]) -> List[Dict[str, Any]]:
         """Extract input fields"""
         inputs = []
         
-        # Use JavaScript to get all visible input fields
-        input_data = self.driver.execute_script("""
-            const inputs = [];
-            const elements = document.querySelectorAll('input, textarea');
-            
-            elements.forEach(el => {
-                const rect = el.getBoundingClientRect();
-                if (rect.width > 0 && rect.height > 0 && 
-                    el.offsetParent !== null &&
-                    el.type !== 'hidden') {
-                    inputs.push({
-                        tag: el.tagName.toLowerCase(),
-                        type: el.type || 'text',
-                        name: el.name || '',
-                        id: el.id || '',
-                        placeholder: el.placeholder || '',
-                        value: el.value || '',
-                        ariaLabel: el.getAttribute('aria-label') || '',
-                        className: el.className || '',
-                        rect: {
-                            x: rect.x,
-                            y: rect.y,
-                            width: rect.width,
-                            height: rect.height
-                        }
-                    });
-                }
-            });
-            
-            return inputs;
-        """)
-        
         for input_info in input_data:
             element_id = f"input_{self.element_counter}"
             self.element_counter += 1
             
-            # Find the actual element for mapping
-            if input_info['id']:
-                element = self.driver.find_element(By.ID, input_info['id'])
-            elif input_info['name']:
-                element = self.driver.find_element(By.NAME, input_info['name'])
-            else:
-                # Use XPath with multiple attributes
-                xpath = f"//{input_info['tag']}"
-                if input_info['type']:
-                    xpath += f"[@type='{input_info['type']}']"
-                if input_info['placeholder']:
-                    xpath += f"[@placeholder='{input_info['placeholder']}']"
-                try:
-                    element = self.driver.find_element(By.XPATH, xpath)
-                except:
-                    continue
-            
-            self.element_map[element_id] = element
+            self.element_map[element_id] = input_info['el']
             
             # Determine input purpose
             purpose = self._determine_input_purpose(input_info)
@@ -156,183 +226,55 @@ class DOMExtractor:
     def _determine_input_purpose(self, input_info: Dict) -> str:
         """Determine the likely purpose of an input field"""
         combined = f"{input_info['name']} {input_info['id']} {input_info['placeholder']} {input_info['ariaLabel']}".lower()
-        
-        if 'search' in combined or 'query' in combined or 'q' == input_info['name']:
-            return "search"
-        elif 'email' in combined:
-            return "email"
-        elif 'password' in combined or input_info['type'] == 'password':
-            return "password"
-        elif 'user' in combined or 'login' in combined:
-            return "username"
-        elif 'phone' in combined or 'tel' in combined:
-            return "phone"
-        else:
-            return "text"
+        return _classify_purpose(combined, input_info['name'], input_info['type'])
     
-    def _extract_links(self) -> List[Dict[str, Any]]:
+    def _extract_links(self, link_data: List[Dict]) -> List[Dict[str, Any]]:
         """Extract visible links"""
         links = []
         
-        link_data = self.driver.execute_script("""
-            const links = [];
-            const elements = document.querySelectorAll('a[href]');
-            
-            elements.forEach(el => {
-                const rect = el.getBoundingClientRect();
-                if (rect.width > 0 && rect.height > 0 && 
-                    el.offsetParent !== null) {
-                    const text = el.innerText || el.textContent || '';
-                    if (text.trim()) {
-                        links.push({
-                            href: el.href,
-                            text: text.trim().substring(0, 100),
-                            title: el.title || '',
-                            rect: {
-                                x: rect.x,
-                                y: rect.y,
-                                width: rect.width,
-                                height: rect.height
-                            }
-                        });
-                    }
-                }
-            });
-            
-            return links;
-        """)
-        
-        for link_info in link_data[:50]:  # Limit to 50 most relevant links
+        for link_info in link_data:
             element_id = f"link_{self.element_counter}"
             self.element_counter += 1
+            self.element_map[element_id] = link_info['el']
             
-            # Find the actual element
-            try:
-                element = self.driver.find_element(By.XPATH, f"//a[@href='{link_info['href']}']")
-                self.element_map[element_id] = element
-                
-                links.append({
-                    "element_id": element_id,
-                    "type": "link",
-                    "text": link_info['text'],
-                    "href": link_info['href'],
-                    "position": link_info['rect']
-                })
-            except:
-                continue
+            links.append({
+                "element_id": element_id,
+                "type": "link",
+                "text": link_info['text'],
+                "href": link_info['href'],
+                "position": link_info['rect']
+            })
         
         return links
     
-    def _extract_buttons(self) -> List[Dict[str, Any]]:
+    def _extract_buttons(self, button_data: List[Dict]) -> List[Dict[str, Any]]:
         """Extract visible buttons"""
         buttons = []
         
-        button_data = self.driver.execute_script("""
-            const buttons = [];
-            const elements = document.querySelectorAll('button, input[type="submit"], input[type="button"], [role="button"]');
-            
-            elements.forEach(el => {
-                const rect = el.getBoundingClientRect();
-                if (rect.width > 0 && rect.height > 0 && 
-                    el.offsetParent !== null) {
-                    const text = el.innerText || el.textContent || el.value || '';
-                    if (text.trim() || el.type === 'submit') {
-                        buttons.push({
-                            tag: el.tagName.toLowerCase(),
-                            type: el.type || 'button',
-                            text: text.trim().substring(0, 50),
-                            ariaLabel: el.getAttribute('aria-label') || '',
-                            className: el.className || '',
-                            rect: {
-                                x: rect.x,
-                                y: rect.y,
-                                width: rect.width,
-                                height: rect.height
-                            }
-                        });
-                    }
-                }
-            });
-            
-            return buttons;
-        """)
-        
-        for button_info in button_data[:30]:  # Limit buttons
+        for button_info in button_data:
             element_id = f"button_{self.element_counter}"
             self.element_counter += 1
+            self.element_map[element_id] = button_info['el']
             
-            # Build XPath to find the element
-            xpath = f"//{button_info['tag']}"
-            text = button_info['text']
-            if text:
-                # Escape quotes in text
-                text = text.replace('"', '\\"')
-                xpath = f"//{button_info['tag']}[contains(., '{text}')]"
-            
-            try:
-                element = self.driver.find_element(By.XPATH, xpath)
-                self.element_map[element_id] = element
-                
-                buttons.append({
-                    "element_id": element_id,
-                    "type": "button",
-                    "text": button_info['text'] or button_info['ariaLabel'] or "Submit",
-                    "button_type": button_info['type'],
-                    "position": button_info['rect']
-                })
-            except:
-                continue
+            buttons.append({
+                "element_id": element_id,
+                "type": "button",
+                "text": button_info['text'] or button_info['ariaLabel'] or "Submit",
+                "button_type": button_info['type'],
+                "position": button_info['rect']
+            })
         
         return buttons
     
-    def _extract_selects(self) -> List[Dict[str, Any]]:
+    def _extract_selects(self, select_data: List[Dict]) -> List[Dict[str, Any]]:
         """Extract select dropdowns"""
         selects = []
         
-        select_data = self.driver.execute_script("""
-            const selects = [];
-            const elements = document.querySelectorAll('select');
-            
-            elements.forEach(el => {
-                const rect = el.getBoundingClientRect();
-                if (rect.width > 0 && rect.height > 0 && 
-                    el.offsetParent !== null) {
-                    const options = Array.from(el.options).map(opt => ({
-                        value: opt.value,
-                        text: opt.text
-                    }));
-                    
-                    selects.push({
-                        name: el.name || '',
-                        id: el.id || '',
-                        selectedIndex: el.selectedIndex,
-                        options: options.slice(0, 20), // Limit options
-                        rect: {
-                            x: rect.x,
-                            y: rect.y,
-                            width: rect.width,
-                            height: rect.height
-                        }
-                    });
-                }
-            });
-            
-            return selects;
-        """)
-        
         for select_info in select_data:
             element_id = f"select_{self.element_counter}"
             self.element_counter += 1
             
-            # Find the actual element
-            if select_info['id']:
-                element = self.driver.find_element(By.ID, select_info['id'])
-            elif select_info['name']:
-                element = self.driver.find_element(By.NAME, select_info['name'])
-            else:
-                continue
-            
-            self.element_map[element_id] = element
+            self.element_map[element_id] = select_info['el']
             
             selects.append({
                 "element_id": element_id,
@@ -344,42 +286,6 @@ class DOMExtractor:
         
         return selects
     
-    def _extract_important_text(self) -> List[str]:
-        """Extract important visible text content"""
-        
-        # Get main text content
-        text_content = self.driver.execute_script("""
-            const texts = [];
-            
-            // Get search results or main content
-            const selectors = [
-                '.g',  // Google search results
-                'h1', 'h2', 'h3',  // Headers
-                'article',  // Article content
-                'main',  // Main content
-                '.result',  // Generic results
-                'p'  // Paragraphs
-            ];
-            
-            selectors.forEach(selector => {
-                const elements = document.querySelectorAll(selector);
-                elements.forEach(el => {
-                    const rect = el.getBoundingClientRect();
-                    if (rect.width > 0 && rect.height > 0) {
-                        const text = el.innerText || el.textContent || '';
-                        const trimmed = text.trim();
-                        if (trimmed && trimmed.length > 20 && trimmed.length < 500) {
-                            texts.push(trimmed);
-                        }
-                    }
-                });
-            });
-            
-            return [...new Set(texts)].slice(0, 20);  // Unique texts, max 20
-        """)
-        
-        return text_content
-    
     def get_element_by_id(self, element_id: str) -> Optional[WebElement]:
         """Get the actual WebElement by its extracted ID"""
         return self.element_map.get(element_id)
@@ -387,52 +293,52 @@ class DOMExtractor:
     def format_for_claude(self, page_info: Dict[str, Any]) -> str:
         """Format extracted page info for Claude in a concise way"""
         
-        formatted = f"=== Page: {page_info['title']} ===\n"
-        formatted += f"URL: {page_info['url']}\n"
-        formatted += f"Viewport: {page_info['viewport']['width']}x{page_info['viewport']['height']}\n"
-        formatted += f"Scroll: {page_info['scroll_position']['y']}/{page_info['viewport']['scrollHeight']}\n\n"
-        
-        # Interactive elements
-        formatted += "=== Interactive Elements ===\n"
-        
-        # Group by type
-        inputs = [e for e in page_info['elements'] if e['type'] == 'input']
-        buttons = [e for e in page_info['elements'] if e['type'] == 'button']
-        links = [e for e in page_info['elements'] if e['type'] == 'link']
-        selects = [e for e in page_info['elements'] if e['type'] == 'select']
+        parts = [
+            f"=== Page: {page_info['title']} ===\n",
+            f"URL: {page_info['url']}\n",
+            f"Viewport: {page_info['viewport']['width']}x{page_info['viewport']['height']}\n",
+            f"Scroll: {page_info['scroll_position']['y']}/{page_info['viewport']['scrollHeight']}\n\n",
+            # Interactive elements
+            "=== Interactive Elements ===\n"
+        ]
+        
+        # Already grouped by type
+        elements = page_info['elements']
+        inputs = elements['inputs']
+        buttons = elements['buttons']
+        links = elements['links']
+        selects = elements['selects']
         
         if inputs:
-            formatted += "\nInput Fields:\n"
+            parts.append("\nInput Fields:\n")
             for inp in inputs:
-                formatted += f"  [{inp['element_id']}] {inp['purpose']} input"
+                parts.append(f"  [{inp['element_id']}] {inp['purpose']} input")
                 if inp['placeholder']:
-                    formatted += f" (placeholder: '{inp['placeholder']}')"
+                    parts.append(f" (placeholder: '{inp['placeholder']}')")
                 if inp['current_value']:
-                    formatted += f" [value: '{inp['current_value'][:30]}']"
-                formatted += "\n"
+                    parts.append(f" [value: '{inp['current_value'][:30]}']")
+                parts.append("\n")
         
         if buttons:
-            formatted += "\nButtons:\n"
+            parts.append("\nButtons:\n")
             for btn in buttons[:10]:  # Limit buttons shown
-                formatted += f"  [{btn['element_id']}] '{btn['text']}'\n"
+                parts.append(f"  [{btn['element_id']}] '{btn['text']}'\n")
         
         if links:
-            formatted += "\nLinks:\n"
+            parts.append("\nLinks:\n")
             for link in links[:15]:  # Limit links shown
                 text = link['text'][:50] + "..." if len(link['text']) > 50 else link['text']
-                formatted += f"  [{link['element_id']}] {text}\n"
+                parts.append(f"  [{link['element_id']}] {text}\n")
         
         if selects:
-            formatted += "\nDropdowns:\n"
+            parts.append("\nDropdowns:\n")
             for sel in selects:
-                formatted += f"  [{sel['element_id']}] Select: {sel['current_value']} (options: {', '.join(sel['options'][:5])}...)\n"
+                parts.append(f"  [{sel['element_id']}] Select: {sel['current_value']} (options: {', '.join(sel['options'][:5])}...)\n")
         
         # Important text
         if page_info['text_content']:
-            formatted += "\n=== Page Content ===\n"
-            for text in page_info['text_content'][:10]:
-                if len(text) > 100:
-                    text = text[:100] + "..."
-                formatted += f"• {text}\n"
+            parts.append("\n=== Page Content ===\n")
+            for text in page_info['text_content']:
+                parts.append(f"• {text}\n")
         
-        return formatted
\ No newline at end of file
+        return "".join(parts)
@@ -3,22 +3,274 @@ Main Entry Point - Google Search Agent with Claude AI
 Orchestrates browser setup, agent initialization, and task execution
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import argparse
+import hashlib
 import json
+import logging
+import queue
+import signal
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import count
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+# browser_setup / search_agent pull in Selenium and the anthropic SDK; main() imports
+# them only after argument parsing, so --help and daemon hand-offs return at once
+if TYPE_CHECKING:
+    from search_agent import GoogleSearchAgent
+
+# Successful task results are reused for an hour, so a retyped task skips the Claude
+# loop, and a rescheduled single --task run doesn't even launch the browser
+RESULT_CACHE_FILE = Path.home() / ".cache" / "brightdata_proxy" / "agent_results.sqlite3"
+RESULT_CACHE_TTL = 3600  # seconds
+
+
+class ResultCache:
+    """SQLite-backed cache of successful agent results, keyed by goal and agent mode"""
+    
+    def __init__(self, mode: tuple, enabled: bool = True, path: Path = RESULT_CACHE_FILE, ttl: int = RESULT_CACHE_TTL):
+        self.mode = mode
+        self.ttl = ttl
+        self.db = None
+        self.lock = threading.Lock()  # batch workers share the connection
+        if enabled:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.db = sqlite3.connect(str(path), check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS results (fingerprint TEXT PRIMARY KEY, result_json TEXT, ts REAL)"
+            )
+            # Moving average of how long each goal took, for ordering batches
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS durations (fingerprint TEXT PRIMARY KEY, seconds REAL)"
+            )
+    
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Case, spacing and trailing punctuation don't change what a goal asks for"""
+        return " ".join(text.casefold().split()).rstrip(".?!")
+    
+    def _fingerprint(self, kind: str, goal: tuple) -> str:
+        goal = [self._normalize(part) for part in goal]
+        return hashlib.sha256(json.dumps([kind, *goal, *self.mode]).encode()).hexdigest()
+    
+    def lookup(self, kind: str, *goal) -> Optional[dict]:
+        """Return the cached result for (kind, goal) if it is still fresh, else None"""
+        if self.db is None:
+            return None
+        
+        with self.lock:
+            row = self.db.execute(
+                "SELECT result_json, ts FROM results WHERE fingerprint = ?", (self._fingerprint(kind, goal),)
+            ).fetchone()
+        if row and time.time() - row[1] < self.ttl:
+            print(f"[INFO] Reusing result cached {int(time.time() - row[1])}s ago (use 'cache-clear' or --no-cache to rerun)")
+            return json.loads(row[0])
+        return None
+    
+    def call(self, kind: str, fn, *goal) -> dict:
+        """Return the cached result for (kind, goal) or run fn(*goal) and cache it on success"""
+        if self.db is None:
+            return fn(*goal)
+        
+        cached = self.lookup(kind, *goal)
+        if cached is not None:
+            return cached
+        
+        fingerprint = self._fingerprint(kind, goal)
+        started = time.perf_counter()
+        result = fn(*goal)
+        self._record_duration(fingerprint, time.perf_counter() - started)
+        if result.get('success'):
+            with self.lock:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                    (fingerprint, json.dumps(result, default=str), time.time())
+                )
+                self.db.commit()
+        return result
+    
+    def _record_duration(self, fingerprint: str, seconds: float, alpha: float = 0.3):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT seconds FROM durations WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            if row:
+                seconds = alpha * seconds + (1 - alpha) * row[0]
+            self.db.execute("INSERT OR REPLACE INTO durations VALUES (?, ?)", (fingerprint, seconds))
+            self.db.commit()
+    
+    def estimated_duration(self, kind: str, *goal) -> float:
+        """Average past runtime of this goal, or a rough guess from its length"""
+        if self.db is not None:
+            with self.lock:
+                row = self.db.execute(
+                    "SELECT seconds FROM durations WHERE fingerprint = ?", (self._fingerprint(kind, goal),)
+                ).fetchone()
+            if row:
+                return row[0]
+        return 2.0 * sum(len(part.split()) for part in goal)
+    
+    def clear(self):
+        """Drop every cached result"""
+        if self.db is not None:
+            with self.lock:
+                self.db.execute("DELETE FROM results")
+                self.db.commit()
+    
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+
+
+# Parsed search results per page URL; cleared by every command that changes the page
+_results_cache: Dict[str, list] = {}
+
+
+def _get_results(agent: GoogleSearchAgent) -> list:
+    """agent.extract_search_results(), reused while the browser stays on the same URL"""
+    url = agent.driver.current_url
+    if url not in _results_cache:
+        _results_cache[url] = agent.extract_search_results()
+    return _results_cache[url]
+
+
+def _do_search(agent: GoogleSearchAgent, cache: ResultCache, query: str):
+    if query:
+        print(f"\n[AGENT] Searching for: {query}")
+        _results_cache.clear()
+        result = agent.search(query)
+        if result['success']:
+            # search() already extracted the results of the page it ends on
+            _results_cache[result['url']] = result['results']
+        print_result(result)
+    else:
+        print("[ERROR] Please provide a search query")
+
+
+def _do_visit(agent: GoogleSearchAgent, cache: ResultCache, rest: str):
+    query, sep, link_text = rest.partition(' -> ')
+    query, link_text = query.strip(), link_text.strip()
+    if sep and query and link_text:
+        print(f"\n[AGENT] Searching for '{query}' and visiting '{link_text}'")
+        _results_cache.clear()
+        result = cache.call('visit', agent.search_and_visit, query, link_text)
+        print_result(result)
+    else:
+        print("[ERROR] Format: visit <query> -> <link text>")
+
+
+def _do_task(agent: GoogleSearchAgent, cache: ResultCache, task: str):
+    if task:
+        print(f"\n[AGENT] Executing task: {task}")
+        _results_cache.clear()
+        result = cache.call('task', agent.run, task)
+        print_result(result)
+    else:
+        print("[ERROR] Please provide a task description")
 
-# Load environment variables
-load_dotenv()
 
-# Import our modules
-from browser_setup import create_browser
-from search_agent import GoogleSearchAgent
+# Fixed per process; the sequence number keeps successive screenshots from overwriting each other
+_SCREENSHOT_PREFIX = f"screenshot_{Path.cwd().name}_{os.getpid()}"
+_screenshot_seq = count(1)
 
 
-def interactive_mode(agent: GoogleSearchAgent):
+def _do_screenshot(agent: GoogleSearchAgent, cache: ResultCache, rest: str):
+    filename = f"{_SCREENSHOT_PREFIX}_{next(_screenshot_seq)}.png"
+    agent.take_screenshot(filename)
+    print(f"[INFO] Screenshot saved to {filename}")
+
+
+def _do_results(agent: GoogleSearchAgent, cache: ResultCache, rest: str):
+    try:
+        results = _get_results(agent)
+        if results:
+            lines = ["\n=== Search Results ==="]
+            for i, result in enumerate(results, 1):
+                lines.append(f"\n{i}. {result['title']}")
+                lines.append(f"   URL: {result['url']}")
+                if result['description']:
+                    lines.append(f"   {result['description'][:100]}...")
+            print("\n".join(lines))
+        else:
+            print("[INFO] No search results found on current page")
+    except:
+        print("[ERROR] Not on a search results page")
+
+
+def _do_cache_clear(agent: GoogleSearchAgent, cache: ResultCache, rest: str):
+    cache.clear()
+    print("[INFO] Result cache cleared")
+
+
+def _do_url(agent: GoogleSearchAgent, cache: ResultCache, rest: str):
+    print(f"Current URL: {agent.driver.current_url}")
+
+
+def _do_back(agent: GoogleSearchAgent, cache: ResultCache, rest: str):
+    _results_cache.clear()
+    agent.actions.go_back()
+    print("[INFO] Navigated back")
+
+
+def _do_forward(agent: GoogleSearchAgent, cache: ResultCache, rest: str):
+    _results_cache.clear()
+    agent.actions.go_forward()
+    print("[INFO] Navigated forward")
+
+
+def _do_refresh(agent: GoogleSearchAgent, cache: ResultCache, rest: str):
+    _results_cache.clear()
+    agent.actions.refresh_page()
+    print("[INFO] Page refreshed")
+
+
+def _do_help(agent: GoogleSearchAgent, cache: ResultCache, rest: str):
+    print_help()
+
+
+# Interactive command verb -> handler(agent, cache, rest of the line); 'quit' is handled by the loop
+COMMANDS: Dict[str, Callable[[GoogleSearchAgent, ResultCache, str], None]] = {
+    'search': _do_search,
+    'visit': _do_visit,
+    'task': _do_task,
+    'screenshot': _do_screenshot,
+    'results': _do_results,
+    'cache-clear': _do_cache_clear,
+    'url': _do_url,
+    'back': _do_back,
+    'forward': _do_forward,
+    'refresh': _do_refresh,
+    'help': _do_help,
+}
+
+HELP_TEXT = "\n".join([
+    "\n=== Available Commands ===",
+    "search <query>           - Search Google for a query",
+    "visit <query> -> <text>  - Search and click on specific result",
+    "task <description>       - Execute a custom task",
+    "screenshot              - Take a screenshot of current page",
+    "results                 - Show search results from current page",
+    "url                     - Show current URL",
+    "back                    - Go back in browser history",
+    "forward                 - Go forward in browser history",
+    "refresh                 - Refresh current page",
+    "cache-clear             - Forget cached task results",
+    "help                    - Show this help message",
+    "quit                    - Exit the program",
+    "="*30,
+])
+
+
+def interactive_mode(agent: GoogleSearchAgent, cache: ResultCache):
     """Run the agent in interactive mode"""
     print("\n" + "="*60)
     print("GOOGLE SEARCH AGENT - Interactive Mode")
@@ -27,150 +279,305 @@ def interactive_mode(agent: GoogleSearchAgent):
     print("Type 'quit' to exit")
     print("="*60 + "\n")
     
+    # prompt_toolkit, when installed, adds persistent history and command completion
+    try:
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.completion import WordCompleter
+        from prompt_toolkit.history import FileHistory
+        session = PromptSession(
+            history=FileHistory(str(Path.home() / ".bdproxy_history")),
+            completer=WordCompleter(list(COMMANDS) + ['quit'])
+        )
+        read_command = lambda: session.prompt("\n> ")
+    except ImportError:
+        read_command = lambda: input("\n> ")
+    
     while True:
         try:
-            command = input("\n> ").strip()
+            command = read_command().strip()
             
             if not command:
                 continue
             
-            if command.lower() == 'quit':
+            verb, _, rest = command.partition(' ')
+            verb = verb.lower()
+            
+            if verb == 'quit':
                 print("Goodbye!")
                 break
             
-            elif command.lower() == 'help':
-                print_help()
-            
-            elif command.lower().startswith('search '):
-                query = command[7:].strip()
-                if query:
-                    print(f"\n[AGENT] Searching for: {query}")
-                    result = agent.search(query)
-                    print_result(result)
-                else:
-                    print("[ERROR] Please provide a search query")
-            
-            elif command.lower().startswith('visit '):
-                parts = command[6:].strip().split(' -> ')
-                if len(parts) == 2:
-                    query, link_text = parts[0].strip(), parts[1].strip()
-                    print(f"\n[AGENT] Searching for '{query}' and visiting '{link_text}'")
-                    result = agent.search_and_visit(query, link_text)
-                    print_result(result)
-                else:
-                    print("[ERROR] Format: visit <query> -> <link text>")
-            
-            elif command.lower().startswith('task '):
-                task = command[5:].strip()
-                if task:
-                    print(f"\n[AGENT] Executing task: {task}")
-                    result = agent.run(task)
-                    print_result(result)
-                else:
-                    print("[ERROR] Please provide a task description")
-            
-            elif command.lower() == 'screenshot':
-                filename = f"screenshot_{Path.cwd().name}_{os.getpid()}.png"
-                agent.take_screenshot(filename)
-                print(f"[INFO] Screenshot saved to {filename}")
-            
-            elif command.lower() == 'results':
-                try:
-                    results = agent.extract_search_results()
-                    if results:
-                        print("\n=== Search Results ===")
-                        for i, result in enumerate(results, 1):
-                            print(f"\n{i}. {result['title']}")
-                            print(f"   URL: {result['url']}")
-                            if result['description']:
-                                print(f"   {result['description'][:100]}...")
-                    else:
-                        print("[INFO] No search results found on current page")
-                except:
-                    print("[ERROR] Not on a search results page")
-            
-            elif command.lower() == 'url':
-                print(f"Current URL: {agent.driver.current_url}")
-            
-            elif command.lower() == 'back':
-                agent.actions.go_back()
-                print("[INFO] Navigated back")
-            
-            elif command.lower() == 'forward':
-                agent.actions.go_forward()
-                print("[INFO] Navigated forward")
-            
-            elif command.lower() == 'refresh':
-                agent.actions.refresh_page()
-                print("[INFO] Page refreshed")
-            
+            handler = COMMANDS.get(verb)
+            if handler:
+                handler(agent, cache, rest.strip())
             else:
                 print(f"[ERROR] Unknown command: {command}")
                 print("Type 'help' for available commands")
                 
         except KeyboardInterrupt:
             print("\n[INFO] Use 'quit' to exit properly")
+        except EOFError:
+            # Ctrl-D or end of piped input
+            print("Goodbye!")
+            break
         except Exception as e:
             print(f"[ERROR] {e}")
 
 
 def print_help():
     """Print available commands"""
-    print("\n=== Available Commands ===")
-    print("search <query>           - Search Google for a query")
-    print("visit <query> -> <text>  - Search and click on specific result")
-    print("task <description>       - Execute a custom task")
-    print("screenshot              - Take a screenshot of current page")
-    print("results                 - Show search results from current page")
-    print("url                     - Show current URL")
-    print("back                    - Go back in browser history")
-    print("forward                 - Go forward in browser history")
-    print("refresh                 - Refresh current page")
-    print("help                    - Show this help message")
-    print("quit                    - Exit the program")
-    print("="*30)
+    print(HELP_TEXT)
 
 
 def print_result(result: dict):
     """Pretty print agent result"""
-    print("\n" + "="*60)
+    # Built up and written once, so it can't interleave with output from batch workers
+    lines = ["\n" + "="*60]
+    # search() results carry no step count
+    steps = result.get('steps')
     if result['success']:
-        print("[SUCCESS] Task completed!")
-        print(f"Steps taken: {result['steps']}")
-        print(f"\nResult:\n{result.get('result', 'No specific result')}")
+        lines.append("[SUCCESS] Task completed!")
+        if steps is not None:
+            lines.append(f"Steps taken: {steps}")
+        lines.append(f"\nResult:\n{result.get('result', 'No specific result')}")
     else:
-        print("[FAILED] Task could not be completed")
-        print(f"Error: {result.get('error', 'Unknown error')}")
-        print(f"Steps taken: {result['steps']}")
-    
-    if result.get('history'):
-        print("\n=== Action History ===")
-        for entry in result['history'][-5:]:  # Show last 5 actions
-            print(f"Step {entry['step']}: {entry['action']} {entry.get('parameters', {})}")
-    print("="*60)
+        lines.append("[FAILED] Task could not be completed")
+        lines.append(f"Error: {result.get('error', 'Unknown error')}")
+        if steps is not None:
+            lines.append(f"Steps taken: {steps}")
+    
+    history = result.get('history')
+    if history:
+        lines.append("\n=== Action History ===")
+        for entry in history[-5:]:  # Show last 5 actions
+            lines.append(f"Step {entry['step']}: {entry['action']} {entry.get('parameters', {})}")
+    lines.append("="*60)
+    print("\n".join(lines))
 
 
-def run_single_task(agent: GoogleSearchAgent, task: str):
+def run_single_task(agent: GoogleSearchAgent, task: str, cache: ResultCache):
     """Run a single task and exit"""
     print(f"\n[AGENT] Executing task: {task}")
-    result = agent.run(task)
+    result = cache.call('task', agent.run, task)
     print_result(result)
     return result['success']
 
 
+def run_batch(agent: GoogleSearchAgent, tasks: list, cache: ResultCache,
+              spawn_agent: Optional[Callable[[], GoogleSearchAgent]] = None, extra: int = 0):
+    """Run tasks in parallel, one browser per worker; returns True if all succeeded
+
+    Work starts on `agent` straight away while `extra` more agents are created in the
+    background with spawn_agent, one at a time, each joining the pool as soon as it's ready.
+    """
+    # Each worker borrows an idle agent (a Selenium driver is not thread-safe)
+    idle_agents = queue.Queue()
+    idle_agents.put(agent)
+    
+    batch_done = threading.Event()
+    
+    def warm_agents():
+        # One at a time, so the launches don't race on chromedriver patching
+        for _ in range(extra):
+            if batch_done.is_set():
+                return
+            try:
+                idle_agents.put(spawn_agent())
+            except Exception as e:
+                print(f"[WARN] Could not start another browser, continuing with fewer: {e}")
+                return
+    
+    warmer = threading.Thread(target=warm_agents, daemon=True)
+    warmer.start()
+    
+    def worker(task):
+        borrowed = idle_agents.get()
+        try:
+            return cache.call('task', borrowed.run, task)
+        finally:
+            idle_agents.put(borrowed)
+    
+    # Longest expected task first, so a slow one doesn't start last and set the makespan;
+    # the executor hands queued tasks to free workers in submission order
+    ordered = sorted(tasks, key=lambda task: cache.estimated_duration('task', task), reverse=True)
+    
+    all_ok = True
+    try:
+        with ThreadPoolExecutor(max_workers=1 + extra) as pool:
+            futures = {pool.submit(worker, task): task for task in ordered}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"success": False, "error": str(e), "steps": 0}
+                print(f"\n[AGENT] Finished task: {futures[future]}")
+                print_result(result)
+                all_ok = all_ok and result['success']
+    finally:
+        # Don't start browsers nobody will use; let one mid-launch finish so it can be quit
+        batch_done.set()
+        warmer.join()
+    return all_ok
+
+
+# Local socket a --daemon agent listens on; later --task runs hand their tasks to it
+# instead of launching their own browser. It lives in a directory only this user can
+# enter ($XDG_RUNTIME_DIR, else a 0700 one under ~/.cache), never in the shared temp dir
+DAEMON_SOCKET = (Path(os.environ["XDG_RUNTIME_DIR"]) if os.environ.get("XDG_RUNTIME_DIR")
+                 else RESULT_CACHE_FILE.parent / "daemon") / "bdproxy-agent.sock"
+
+
+def _owned_by_me(path: Path) -> bool:
+    """True if path exists and belongs to this user (so nobody else can answer on it)"""
+    try:
+        return hasattr(os, "getuid") and path.lstat().st_uid == os.getuid()
+    except OSError:
+        return False
+
+
+def serve_daemon(agent: GoogleSearchAgent, cache: ResultCache):
+    """Keep the browser open and run tasks sent over DAEMON_SOCKET, one JSON line each way"""
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        print("[ERROR] --daemon needs Unix domain sockets (not available on this platform)")
+        return
+    
+    agent_lock = threading.Lock()  # one browser: tasks run one at a time
+    
+    class TaskHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                request = json.loads(self.rfile.readline())
+                if request.get('cmd') != 'task':
+                    raise ValueError(f"unsupported command: {request.get('cmd')}")
+                # The browser was launched for one device and step budget (the cache mode);
+                # a client that wants another one has to run the task itself
+                wanted = (request.get('desktop'), request.get('max_steps'))
+                if wanted != cache.mode:
+                    result = {"rejected": f"daemon runs desktop={cache.mode[0]}, max_steps={cache.mode[1]}"}
+                    self.wfile.write(json.dumps(result).encode() + b"\n")
+                    return
+                print(f"\n[AGENT] Executing task: {request['task']}")
+                with agent_lock:
+                    if request.get('no_cache'):
+                        result = agent.run(request['task'])
+                    else:
+                        result = cache.call('task', agent.run, request['task'])
+            except Exception as e:
+                result = {"success": False, "error": str(e), "steps": 0}
+            self.wfile.write(json.dumps(result, default=str).encode() + b"\n")
+    
+    DAEMON_SOCKET.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not _owned_by_me(DAEMON_SOCKET.parent):
+        print(f"[ERROR] {DAEMON_SOCKET.parent} belongs to another user; not serving on it")
+        return
+    os.chmod(DAEMON_SOCKET.parent, 0o700)
+    if os.path.lexists(DAEMON_SOCKET):
+        if not _owned_by_me(DAEMON_SOCKET):
+            print(f"[ERROR] {DAEMON_SOCKET} belongs to another user; not serving on it")
+            return
+        DAEMON_SOCKET.unlink()
+    # Owner-only from the moment it exists, not after a chmod
+    old_umask = os.umask(0o077)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(str(DAEMON_SOCKET), TaskHandler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+    # SIGTERM unwinds through main()'s finally, which closes the browser
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"[INFO] Daemon listening on {DAEMON_SOCKET}; run 'python main.py --task ...' to use it")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        DAEMON_SOCKET.unlink(missing_ok=True)
+
+
+def forward_to_daemon(task: str, args: argparse.Namespace) -> Optional[dict]:
+    """Run task on a running --daemon agent; None if no daemon is reachable or it runs another mode"""
+    if not hasattr(socket, "AF_UNIX") or not os.path.lexists(DAEMON_SOCKET):
+        return None
+    if not _owned_by_me(DAEMON_SOCKET):
+        print(f"[WARNING] {DAEMON_SOCKET} is not owned by you; not sending it tasks, running locally")
+        return None
+    request = {"cmd": "task", "task": task, "desktop": args.desktop,
+               "max_steps": args.max_steps, "no_cache": args.no_cache}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(str(DAEMON_SOCKET))
+            conn.sendall(json.dumps(request).encode() + b"\n")
+            with conn.makefile("rb") as reply:
+                result = json.loads(reply.readline())
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] Daemon at {DAEMON_SOCKET} not usable ({e}); running locally")
+        return None
+    if 'rejected' in result:
+        print(f"[WARNING] Daemon at {DAEMON_SOCKET} {result['rejected']}; running locally")
+        return None
+    return result
+
+
 def main():
     """Main entry point"""
     
     parser = argparse.ArgumentParser(description='Google Search Agent powered by Claude AI')
-    parser.add_argument('--task', type=str, help='Task to execute (non-interactive mode)')
+    parser.add_argument('--task', type=str, action='append',
+                        help='Task to execute (non-interactive mode); repeat for a batch')
+    parser.add_argument('--tasks-file', type=Path, help='File with one task per line, run as a batch')
+    parser.add_argument('--parallel', type=int, default=1,
+                        help='Browsers to run batch tasks on concurrently (default: 1)')
     parser.add_argument('--search', type=str, help='Search query (non-interactive mode)')
     parser.add_argument('--headless', action='store_true', help='Run browser in headless mode')
     parser.add_argument('--desktop', action='store_true', help='Use desktop mode instead of mobile')
     parser.add_argument('--max-steps', type=int, default=5, help='Maximum steps for agent (default: 5)')
     parser.add_argument('--api-key', type=str, help='Anthropic API key (overrides env var)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep the browser open and serve --task runs from other processes')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Always run tasks instead of reusing results cached in the last {RESULT_CACHE_TTL}s')
+    parser.add_argument('--verbose', action='store_true', help='Show every browser action as it happens')
     
     args = parser.parse_args()
     
+    # actions.py logs through logging: warnings and errors always, per-action progress with --verbose.
+    # Only that module goes to DEBUG - Selenium and selenium-wire debug output would drown it out
+    logging.basicConfig(level=logging.WARNING, format="[%(levelname)s] %(message)s")
+    if args.verbose:
+        logging.getLogger("actions").setLevel(logging.DEBUG)
+    
+    tasks = list(args.task or [])
+    if args.tasks_file:
+        tasks += [line.strip() for line in args.tasks_file.read_text(encoding="utf-8").splitlines() if line.strip()]
+    workers = max(1, min(args.parallel, len(tasks)))
+    
+    # Hand tasks to a running daemon if there is one: no browser startup at all
+    if tasks and not args.daemon:
+        results = [forward_to_daemon(task, args) for task in tasks[:1]]
+        if results[0] is not None:
+            for task in tasks[1:]:
+                results.append(forward_to_daemon(task, args) or {"success": False, "error": "Daemon went away", "steps": 0})
+            for task, result in zip(tasks, results):
+                print(f"\n[AGENT] Task (via daemon): {task}")
+                print_result(result)
+            sys.exit(0 if all(result['success'] for result in results) else 1)
+    
+    # Results depend on the emulated device and the step budget, not on headless
+    cache = ResultCache(mode=(args.desktop, args.max_steps), enabled=not args.no_cache)
+    
+    # A cached single task is answered before any browser is launched
+    if len(tasks) == 1 and not args.daemon:
+        result = cache.lookup('task', tasks[0])
+        if result is not None:
+            print(f"\n[AGENT] Task (cached): {tasks[0]}")
+            print_result(result)
+            sys.exit(0 if result['success'] else 1)
+    
+    # Load environment variables from the .env beside this script, if there is one
+    # (containers get them injected and have no file to search for)
+    env_file = Path(__file__).resolve().with_name('.env')
+    if env_file.is_file():
+        from dotenv import load_dotenv
+        load_dotenv(env_file, override=False)
+    
     # Check for API key
     api_key = args.api_key or os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
@@ -183,6 +590,10 @@ def main():
         print("[WARNING] BRIGHTDATA_PROXY not set - running without proxy")
         print("Set it in .env file for proxy support")
     
+    # Import our modules
+    from browser_setup import create_browser
+    from search_agent import GoogleSearchAgent
+    
     print("\n" + "="*60)
     print("GOOGLE SEARCH AGENT")
     print("Powered by Claude AI")
@@ -202,6 +613,8 @@ def main():
         print(f"[ERROR] Failed to create browser: {e}")
         sys.exit(1)
     
+    extra_drivers = []
+    
     try:
         # Create agent
         print("[INFO] Initializing Claude agent...")
@@ -209,9 +622,24 @@ def main():
         agent.max_steps = args.max_steps
         
         # Run based on mode
-        if args.task:
+        if args.daemon:
+            serve_daemon(agent, cache)
+        
+        elif len(tasks) > 1:
+            # Batch mode: one more browser per extra worker, started while the first tasks run
+            def spawn_agent():
+                extra_drivers.append(create_browser(headless=args.headless, mobile=not args.desktop))
+                extra_agent = GoogleSearchAgent(extra_drivers[-1], api_key=api_key)
+                extra_agent.max_steps = args.max_steps
+                return extra_agent
+            
+            print(f"[INFO] Running {len(tasks)} tasks on up to {workers} browser(s)")
+            success = run_batch(agent, tasks, cache, spawn_agent, workers - 1)
+            sys.exit(0 if success else 1)
+        
+        elif tasks:
             # Single task mode
-            success = run_single_task(agent, args.task)
+            success = run_single_task(agent, tasks[0], cache)
             sys.exit(0 if success else 1)
         
         elif args.search:
@@ -222,12 +650,13 @@ def main():
             
             # Show extracted results
             try:
-                results = agent.extract_search_results()
+                results = result['results'] if result['success'] else _get_results(agent)
                 if results:
-                    print("\n=== Search Results ===")
+                    lines = ["\n=== Search Results ==="]
                     for i, res in enumerate(results[:5], 1):
-                        print(f"\n{i}. {res['title']}")
-                        print(f"   {res['url']}")
+                        lines.append(f"\n{i}. {res['title']}")
+                        lines.append(f"   {res['url']}")
+                    print("\n".join(lines))
             except:
                 pass
             
@@ -235,7 +664,7 @@ def main():
         
         else:
             # Interactive mode
-            interactive_mode(agent)
+            interactive_mode(agent, cache)
     
     except KeyboardInterrupt:
         print("\n[INFO] Interrupted by user")
@@ -247,6 +676,9 @@ def main():
         # Clean up
         print("\n[INFO] Closing browser...")
         driver.quit()
+        for extra_driver in extra_drivers:
+            extra_driver.quit()
+        cache.close()
         print("[INFO] Goodbye!")
 
 
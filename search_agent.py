@@ -7,17 +7,216 @@ import os
 import json
 import time
 import random
+import threading
+from collections import OrderedDict, deque
 from typing import Dict, Any, Optional, List
 from anthropic import Anthropic
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
 from dom_extractor import DOMExtractor
 from actions import BrowserActions
 
 
+# One Anthropic client per API key, shared by every agent so they reuse its connection pool
+_CLIENTS: Dict[str, Anthropic] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _get_client(api_key: str) -> Anthropic:
+    """Return the shared client for api_key, creating it on first use"""
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(api_key)
+        if client is None:
+            client = _CLIENTS[api_key] = Anthropic(api_key=api_key)
+        return client
+
+
+# Instructions sent as the system prompt on every decide_action call
+_SYSTEM_PROMPT = """You are a web automation agent controlling a browser.
+Your goal is to complete the given task by interacting with web pages.
+
+You can perform these actions:
+- type: Type text into an input field (specify element_id and text)
+- click: Click on an element (specify element_id)
+- submit: Submit a form (specify element_id of an input field)
+- scroll: Scroll the page (specify direction: up/down/top/bottom)
+- select: Select from dropdown (specify element_id and option)
+- done: Task is complete (provide the result)
+- error: Cannot proceed (explain why)
+
+Respond with a JSON object containing:
+{
+    "action": "action_name",
+    "parameters": {...},
+    "reasoning": "why you chose this action",
+    "progress": "what you've accomplished so far"
+}"""
+
+# Recent search() results shared by agents created with cache_searches=True
+_QUERY_CACHE = OrderedDict()  # normalised query -> (stored_at, results, url), oldest first
+_QUERY_CACHE_SIZE = 64
+_QUERY_CACHE_TTL = 300  # seconds
+_QUERY_CACHE_LOCK = threading.Lock()
+
+# Reused for every Claude reply
+_JSON_DECODER = json.JSONDecoder()
+
+class _JSONObjectEnd:
+    """Tracks streamed text until the first top-level JSON object closes
+
+    Braces inside JSON strings are ignored, so a '}' in the reasoning text doesn't end it early.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> bool:
+        """Consume a chunk; True once the outermost object has been closed"""
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"' and self.depth:
+                self.in_string = True
+            elif ch == '{':
+                self.depth += 1
+            elif ch == '}' and self.depth:
+                self.depth -= 1
+                if not self.depth:
+                    return True
+        return False
+
+# Top 10 organic results as {title, url, description}
+_SEARCH_RESULTS_JS = """
+    const results = [];
+    const searchResults = document.querySelectorAll('.g');
+    
+    searchResults.forEach((result, index) => {
+        if (index < 10) {  // Limit to 10 results
+            const link = result.querySelector('a');
+            const title = result.querySelector('h3');
+            const description = result.querySelector('.VwiC3b, .st, .IsZvec');
+            
+            if (link && title) {
+                results.push({
+                    title: title.innerText || '',
+                    url: link.href || '',
+                    description: description ? description.innerText : ''
+                });
+            }
+        }
+    });
+    
+    return results;
+"""
+
+# Google's /sorry/ interstitial, checked in the page instead of pulling the whole page_source
+_BOT_CHECK_JS = """
+    const text = document.body ? document.body.innerText.slice(0, 4000) : '';
+    return /unusual traffic/i.test(text) && /sorry/i.test(location.href + ' ' + text);
+"""
+
+# Everything search() reads from a results page, in one round trip
+_RESULTS_PAGE_JS = f"""
+    return {{
+        blocked: (function() {{ {_BOT_CHECK_JS} }})(),
+        results: (function() {{ {_SEARCH_RESULTS_JS} }})(),
+        url: location.href
+    }};
+"""
+
+# True once a document other than the one with timeOrigin arguments[0] shows results or the bot check
+_RESULTS_READY_JS = f"""
+    if (performance.timeOrigin === arguments[0]) return false;
+    return !!document.querySelector('.g') || (function() {{ {_BOT_CHECK_JS} }})();
+"""
+
+# Candidate selectors, each joined into one list so the page is searched once rather than per selector
+_CONSENT_BUTTON_SELECTOR = ", ".join([
+    "button[id*='accept']",
+    "button[id*='Accept']",
+    "button[id*='agree']",
+    "button[aria-label*='Accept']",
+    "button[aria-label*='Agree']"
+])
+_SEARCH_BOX_SELECTOR = ", ".join([
+    'input[name="q"]',
+    'textarea[name="q"]',
+    'input[type="search"]',
+    '#APjFqb'  # Google's current search box ID
+])
+_SEARCH_BUTTON_SELECTOR = ", ".join([
+    'input[name="btnK"]',
+    'button[aria-label*="Search"]',
+    'input[type="submit"]'
+])
+
+# First visible element matching the selector list in arguments[0], or null
+_FIRST_VISIBLE_JS = """
+    return [...document.querySelectorAll(arguments[0])].find(el => el.offsetParent !== null) || null;
+"""
+
+# Identifies the DOM as of now: URL, load state, which document load, and a mutation count
+# kept by an observer installed on first call. Scroll position is returned alongside, since
+# scrolling doesn't touch the DOM but is still shown to Claude. Runs in an isolated world
+# (see _page_state), so the counter and observer are invisible to the page's own scripts
+_PAGE_STATE_JS = """
+    if (!window.mutations) {
+        window.mutations = {count: 0};
+        new MutationObserver(() => { window.mutations.count++; })
+            .observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    }
+    const doc = document.documentElement;
+    return {
+        key: [location.href, document.readyState, performance.timeOrigin, window.mutations.count],
+        scroll: {x: window.pageXOffset || doc.scrollLeft, y: window.pageYOffset || doc.scrollTop}
+    };
+"""
+
+# Google's Images/News header links, filtered in the page so at most two elements come back
+_NAV_LINKS_JS = """
+    return [...document.querySelectorAll('a[href]')]
+        .filter(a => a.offsetParent !== null && /Images|News/.test(a.innerText))
+        .slice(0, 2);
+"""
+
+# Has the browser open Google's DNS/proxy tunnel/TLS connection in the background
+_PRECONNECT_JS = """
+    for (const rel of ['dns-prefetch', 'preconnect']) {
+        const link = document.createElement('link');
+        link.rel = rel;
+        link.href = arguments[0];
+        document.head.appendChild(link);
+    }
+"""
+
+# Pages visited before Google so the session doesn't open cold on it
+_WARMUP_SITES = (
+    "https://example.com",
+    "https://httpbin.org/headers",
+)
+
+# Homepage links/buttons the exploration may hover over
+_HOVER_LABELS = ("Images", "Gmail", "Search")
+
+# Visible links/buttons whose text is one of arguments[0] - one round trip for all hover candidates
+_HOVER_TARGETS_JS = """
+    return [...document.querySelectorAll('a, button, [role="button"]')]
+        .filter(el => el.offsetParent !== null && arguments[0].includes(el.textContent.trim()));
+"""
+
 class GoogleSearchAgent:
     """Claude-powered agent for Google Search automation"""
     
-    def __init__(self, driver, api_key: str = None):
+    def __init__(self, driver, api_key: str = None, seed: Optional[int] = None,
+                 cache_searches: bool = False):
         self.driver = driver
         self.dom_extractor = DOMExtractor(driver)
         self.actions = BrowserActions(driver)
@@ -27,17 +226,44 @@ class GoogleSearchAgent:
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment")
         
-        self.claude = Anthropic(api_key=self.api_key)
-        self.conversation_history = []
+        self.claude = _get_client(self.api_key)
+        
+        # Own RNG for all the human-like timing and choices: no contention with other
+        # agents on the module-level generator, and a run can be replayed from its seed
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self._rng = random.Random(self.seed)
+        
+        # Serve repeated search() queries from _QUERY_CACHE for a few minutes. A hit returns
+        # results without driving the browser, so leave this off when the caller goes on to
+        # use the results page itself
+        self.cache_searches = cache_searches
+        self.conversation_history = []  # one entry per step, so bounded by max_steps
+        self._recent_actions = deque(maxlen=5)  # formatted lines of the tail _format_history shows Claude
         self.task = None
         self.max_steps = 20
         self.current_step = 0
+        self.current_element_map = {}
+        self._last_page_key = None
+        self._last_analysis = None
+        self._state_context = None  # isolated world _PAGE_STATE_JS runs in, until the next navigation
+        self._failed_attempts = set()  # (page key, action, parameters) that failed this task
+        
+        # Browser actions Claude can pick, each called as handler(params, element)
+        self._action_table = {
+            "type": self._do_type,
+            "click": self._do_click,
+            "submit": self._do_submit,
+            "scroll": self._do_scroll,
+            "select": self._do_select,
+        }
     
     def set_task(self, task: str):
         """Set the current task for the agent"""
         self.task = task
         self.current_step = 0
         self.conversation_history = []
+        self._recent_actions.clear()
+        self._failed_attempts.clear()
         print(f"\n[AGENT] Task set: {task}")
     
     def navigate_to_google(self) -> bool:
@@ -54,7 +280,7 @@ class GoogleSearchAgent:
             self.actions.wait_for_page_load()
             
             # Simulate human reading time - IMPORTANT for Google
-            time.sleep(random.uniform(4.0, 7.0))  # Longer initial wait
+            time.sleep(self._rng.uniform(4.0, 7.0))  # Longer initial wait
             
             # Handle cookie consent if present
             self._handle_cookie_consent()
@@ -63,7 +289,7 @@ class GoogleSearchAgent:
             self._explore_google_homepage()
             
             # Additional human-like pause
-            time.sleep(random.uniform(2.0, 4.0))
+            time.sleep(self._rng.uniform(2.0, 4.0))
             
             return True
         except Exception as e:
@@ -73,57 +299,49 @@ class GoogleSearchAgent:
     def _handle_cookie_consent(self):
         """Handle Google's cookie consent dialog if present"""
         try:
-            # Look for common consent buttons
-            consent_selectors = [
-                "button[id*='accept']",
-                "button[id*='Accept']",
-                "button[id*='agree']",
-                "button[aria-label*='Accept']",
-                "button[aria-label*='Agree']"
-            ]
-            
-            for selector in consent_selectors:
-                button = self.actions.wait_for_element(selector, timeout=2)
-                if button:
-                    self.actions.click_element(button)
-                    time.sleep(1)
-                    break
+            # Look for common consent buttons - the page has loaded by now, so no need to poll
+            button = self.driver.execute_script(_FIRST_VISIBLE_JS, _CONSENT_BUTTON_SELECTOR)
+            if button:
+                self.actions.click_element(button)
+                # Dialog closes with a request; wait for it rather than a fixed second
+                self.actions.wait_for_network_idle(timeout=2)
         except:
             # No consent dialog or already handled
             pass
     
     def _session_warmup(self):
         """Warm up the session by visiting some pages first"""
-        warmup_sites = [
-            "https://example.com",
-            "https://httpbin.org/headers",
-        ]
-        
         # Randomly visit 1-2 warmup sites
-        sites_to_visit = random.sample(warmup_sites, random.randint(1, min(2, len(warmup_sites))))
+        sites_to_visit = self._rng.sample(_WARMUP_SITES, self._rng.randint(1, len(_WARMUP_SITES)))
         
         for site in sites_to_visit:
             try:
                 print(f"[AGENT] Warming up session: {site}")
                 self.driver.get(site)
-                time.sleep(random.uniform(2.0, 5.0))  # Stay on page briefly
+                # Connect to Google while we "read", so the real navigation skips the setup
+                self.driver.execute_script(_PRECONNECT_JS, "https://www.google.com")
+                time.sleep(self._rng.uniform(2.0, 5.0))  # Stay on page briefly
                 
                 # Some random interaction
-                if random.random() < 0.3:  # 30% chance to scroll
+                if self._rng.random() < 0.3:  # 30% chance to scroll
                     self.actions.scroll_page("down")
-                    time.sleep(random.uniform(1.0, 2.0))
+                    time.sleep(self._rng.uniform(1.0, 2.0))
                     
             except Exception as e:
                 print(f"[WARN] Warmup failed for {site}: {e}")
                 continue
     
+    def _pick_some(self, items: List[Any], limit: int = 2) -> List[Any]:
+        """Up to `limit` distinct items in random order"""
+        return self._rng.sample(items, min(limit, len(items)))
+    
     def _explore_google_homepage(self):
         """Explore Google homepage like a human before searching"""
         try:
-            exploration_actions = random.randint(1, 3)
+            exploration_actions = self._rng.randint(1, 3)
             
             for _ in range(exploration_actions):
-                action = random.choice([
+                action = self._rng.choice([
                     "scroll_down_up",
                     "hover_elements", 
                     "click_and_back",
@@ -132,44 +350,40 @@ class GoogleSearchAgent:
                 
                 if action == "scroll_down_up":
                     # Scroll down and back up
-                    self.actions.scroll_page("down", amount=random.randint(100, 300))
-                    time.sleep(random.uniform(0.5, 1.5))
-                    self.actions.scroll_page("up", amount=random.randint(50, 200))
+                    self.actions.scroll_page("down", amount=self._rng.randint(100, 300))
+                    time.sleep(self._rng.uniform(0.5, 1.5))
+                    self.actions.scroll_page("up", amount=self._rng.randint(50, 200))
                     
                 elif action == "hover_elements":
                     # Try to hover over common elements
                     try:
-                        elements = ["Images", "Gmail", "Search"]
-                        for elem_text in random.sample(elements, min(2, len(elements))):
-                            elem = self.actions.wait_for_element(f"*[text()='{elem_text}']", timeout=1)
-                            if elem:
-                                self.actions.hover_element(elem)
-                                time.sleep(random.uniform(0.3, 0.8))
+                        targets = self.driver.execute_script(_HOVER_TARGETS_JS, _HOVER_LABELS)
+                        for elem in self._pick_some(targets):
+                            self.actions.hover_element(elem)
+                            time.sleep(self._rng.uniform(0.3, 0.8))
                     except:
                         pass
                         
                 elif action == "click_and_back":
                     # Sometimes click Images/News then come back
-                    if random.random() < 0.2:  # 20% chance
+                    if self._rng.random() < 0.2:  # 20% chance
                         try:
-                            links = self.driver.find_elements("css selector", "a")
-                            if links and len(links) > 2:
-                                random_link = random.choice(links[:5])  # Top links only
-                                if "Images" in random_link.text or "News" in random_link.text:
-                                    random_link.click()
-                                    time.sleep(random.uniform(2.0, 4.0))
-                                    self.driver.back()
-                                    time.sleep(random.uniform(1.0, 2.0))
+                            links = self.driver.execute_script(_NAV_LINKS_JS)
+                            if links:
+                                self._rng.choice(links).click()
+                                time.sleep(self._rng.uniform(2.0, 4.0))
+                                self.driver.back()
+                                time.sleep(self._rng.uniform(1.0, 2.0))
                         except:
                             pass
                             
                 elif action == "micro_scrolls":
                     # Small scrolls like reading
-                    for _ in range(random.randint(2, 4)):
-                        self.actions.scroll_page("down", amount=random.randint(20, 80))
-                        time.sleep(random.uniform(0.3, 1.0))
+                    for _ in range(self._rng.randint(2, 4)):
+                        self.actions.scroll_page("down", amount=self._rng.randint(20, 80))
+                        time.sleep(self._rng.uniform(0.3, 1.0))
                 
-                time.sleep(random.uniform(0.5, 1.5))
+                time.sleep(self._rng.uniform(0.5, 1.5))
                 
         except Exception as e:
             print(f"[WARN] Homepage exploration failed: {e}")
@@ -181,40 +395,42 @@ class GoogleSearchAgent:
             print("[AGENT] Reading search results...")
             
             # Initial pause to "read" top results
-            time.sleep(random.uniform(2.0, 4.0))
+            time.sleep(self._rng.uniform(2.0, 4.0))
             
             # Scroll pattern while reading results
-            scroll_actions = random.randint(2, 4)
+            results = None  # looked up once, on the first hover
+            scroll_actions = self._rng.randint(2, 4)
             for i in range(scroll_actions):
                 # Scroll down to read more results
-                scroll_amount = random.randint(200, 400)
+                scroll_amount = self._rng.randint(200, 400)
                 self.actions.scroll_page("down", amount=scroll_amount)
                 
                 # Reading pause
-                time.sleep(random.uniform(1.5, 3.5))
+                time.sleep(self._rng.uniform(1.5, 3.5))
                 
                 # Sometimes hover over a result
-                if random.random() < 0.3:
+                if self._rng.random() < 0.3:
                     try:
-                        results = self.driver.find_elements("css selector", ".g")
-                        if results and len(results) > i:
+                        if results is None:
+                            results = self.driver.find_elements("css selector", ".g")
+                        if len(results) > i:
                             self.actions.hover_element(results[i])
-                            time.sleep(random.uniform(0.5, 1.0))
+                            time.sleep(self._rng.uniform(0.5, 1.0))
                     except:
                         pass
                 
                 # Sometimes scroll back up a bit to re-read
-                if random.random() < 0.2:
-                    self.actions.scroll_page("up", amount=random.randint(50, 150))
-                    time.sleep(random.uniform(0.5, 1.5))
+                if self._rng.random() < 0.2:
+                    self.actions.scroll_page("up", amount=self._rng.randint(50, 150))
+                    time.sleep(self._rng.uniform(0.5, 1.5))
             
             # Sometimes click on "People also ask" or other elements
-            if random.random() < 0.2:
+            if self._rng.random() < 0.2:
                 try:
                     paa = self.driver.find_elements("css selector", "[jsname='N760b']")
                     if paa:
-                        random.choice(paa[:2]).click()
-                        time.sleep(random.uniform(1.0, 2.0))
+                        self._rng.choice(paa[:2]).click()
+                        time.sleep(self._rng.uniform(1.0, 2.0))
                 except:
                     pass
                     
@@ -222,49 +438,65 @@ class GoogleSearchAgent:
             print(f"[WARN] Search results exploration failed: {e}")
     
     
+    def _eval(self, script: str, context_id: Optional[int] = None) -> Any:
+        """Run a value-returning script body through CDP Runtime.evaluate
+        
+        Skips the WebDriver script wrapper and argument marshalling; only for scripts that
+        take no arguments and return plain JSON data (no elements). context_id picks the
+        execution context (e.g. an isolated world) instead of the page's main world.
+        """
+        params = {"expression": f"(function() {{ {script} }})()", "returnByValue": True}
+        if context_id is not None:
+            params["contextId"] = context_id
+        response = self.driver.execute_cdp_cmd("Runtime.evaluate", params)
+        if "exceptionDetails" in response:
+            details = response["exceptionDetails"]
+            raise JavascriptException(details.get("exception", {}).get("description") or details.get("text"))
+        return response["result"].get("value")
+    
+    def _page_state(self) -> Dict[str, Any]:
+        """_PAGE_STATE_JS in an isolated world: same DOM, but globals the page can't see"""
+        if self._state_context is not None:
+            try:
+                return self._eval(_PAGE_STATE_JS, self._state_context)
+            except WebDriverException:
+                pass  # the world went away with its document - make one in the new one
+        frame_id = self.driver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]["id"]
+        self._state_context = self.driver.execute_cdp_cmd("Page.createIsolatedWorld", {
+            "frameId": frame_id, "worldName": "page_state"
+        })["executionContextId"]
+        return self._eval(_PAGE_STATE_JS, self._state_context)
+    
     def analyze_page(self) -> Dict[str, Any]:
         """Extract and analyze current page with Claude"""
         print("[AGENT] Analyzing page...")
         
-        # Extract page information
-        page_info = self.dom_extractor.extract_page_info()
+        # Re-extract only if the page navigated or its DOM changed since the last analysis
+        state = self._page_state()
+        if self._last_analysis is not None and state['key'] == self._last_page_key:
+            # Same elements (element positions are as of the last extraction); refresh the scroll only
+            page_info = dict(self._last_analysis['page_info'], scroll_position=state['scroll'])
+        else:
+            # Extract page information
+            page_info = self.dom_extractor.extract_page_info()
+            self._last_page_key = state['key']
+            # Store element map for action execution
+            self.current_element_map = self.dom_extractor.element_map
         
         # Format for Claude
         formatted_page = self.dom_extractor.format_for_claude(page_info)
         
-        # Store element map for action execution
-        self.current_element_map = self.dom_extractor.element_map
-        
-        return {
+        self._last_analysis = {
             "page_info": page_info,
             "formatted": formatted_page,
             "element_map": self.current_element_map
         }
+        return self._last_analysis
     
     def decide_action(self, page_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Ask Claude to decide the next action"""
         
         # Build the prompt
-        system_prompt = """You are a web automation agent controlling a browser.
-Your goal is to complete the given task by interacting with web pages.
-
-You can perform these actions:
-- type: Type text into an input field (specify element_id and text)
-- click: Click on an element (specify element_id)
-- submit: Submit a form (specify element_id of an input field)
-- scroll: Scroll the page (specify direction: up/down/top/bottom)
-- select: Select from dropdown (specify element_id and option)
-- done: Task is complete (provide the result)
-- error: Cannot proceed (explain why)
-
-Respond with a JSON object containing:
-{
-    "action": "action_name",
-    "parameters": {...},
-    "reasoning": "why you chose this action",
-    "progress": "what you've accomplished so far"
-}"""
-        
         user_prompt = f"""Current Task: {self.task}
 
 Current Step: {self.current_step + 1}/{self.max_steps}
@@ -278,25 +510,30 @@ Previous Actions:
 What should be the next action to complete the task?"""
         
         try:
-            # Get Claude's decision
-            response = self.claude.messages.create(
+            # Get Claude's decision, streamed so we can stop reading once the JSON object closes
+            chunks = []
+            object_end = _JSONObjectEnd()
+            with self.claude.messages.stream(
                 model="claude-sonnet-4-20250514",  # Fast model for quick decisions
                 max_tokens=500,
                 temperature=0.3,
-                system=system_prompt,
+                system=_SYSTEM_PROMPT,
                 messages=[
                     {"role": "user", "content": user_prompt}
                 ]
-            )
+            ) as stream:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    if object_end.feed(text):
+                        break  # leaving the block closes the stream
             
             # Parse the response
-            response_text = response.content[0].text
+            response_text = "".join(chunks)
             
-            # Try to extract JSON from the response
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                decision = json.loads(json_match.group())
+            # Try to extract JSON from the response: decode the first object, ignoring any text around it
+            start = response_text.find('{')
+            if start != -1:
+                decision, _ = _JSON_DECODER.raw_decode(response_text, start)
             else:
                 # Fallback parsing
                 decision = {
@@ -310,12 +547,15 @@ What should be the next action to complete the task?"""
             print(f"[CLAUDE] Reasoning: {decision.get('reasoning', 'N/A')}")
             
             # Add to history
-            self.conversation_history.append({
+            entry = {
                 "step": self.current_step,
                 "action": decision['action'],
                 "parameters": decision.get('parameters', {}),
                 "url": self.driver.current_url
-            })
+            }
+            self.conversation_history.append(entry)
+            # Formatted once here rather than on each of the next five prompts
+            self._recent_actions.append(f"Step {entry['step']}: {entry['action']} {entry['parameters']}")
             
             return decision
             
@@ -335,64 +575,64 @@ What should be the next action to complete the task?"""
         params = decision.get('parameters', {})
         
         try:
-            if action == "type":
-                element_id = params.get('element_id')
-                text = params.get('text')
-                if element_id and text:
-                    element = self.current_element_map.get(element_id)
-                    if element:
-                        return self.actions.type_text(element, text)
-            
-            elif action == "click":
-                element_id = params.get('element_id')
-                if element_id:
-                    element = self.current_element_map.get(element_id)
-                    if element:
-                        result = self.actions.click_element(element)
-                        if result:
-                            self.actions.wait_for_page_load()
-                        return result
-            
-            elif action == "submit":
-                element_id = params.get('element_id')
-                if element_id:
-                    element = self.current_element_map.get(element_id)
-                    if element:
-                        result = self.actions.submit_form(element)
-                        if result:
-                            self.actions.wait_for_page_load()
-                        return result
-            
-            elif action == "scroll":
-                direction = params.get('direction', 'down')
-                return self.actions.scroll_page(direction)
-            
-            elif action == "select":
-                element_id = params.get('element_id')
-                option = params.get('option')
-                if element_id and option:
-                    element = self.current_element_map.get(element_id)
-                    if element:
-                        return self.actions.select_option(element, option)
-            
-            elif action == "done":
+            if action == "done":
                 print(f"[AGENT] Task completed!")
                 result = params.get('result', decision.get('progress', 'Task completed'))
                 print(f"[RESULT] {result}")
                 return True
             
-            elif action == "error":
+            if action == "error":
                 print(f"[AGENT] Error encountered: {decision.get('reasoning', 'Unknown error')}")
                 return False
             
-            else:
+            handler = self._action_table.get(action)
+            if handler is None:
                 print(f"[WARN] Unknown action: {action}")
                 return False
+            
+            # Resolved once here; handlers get None for a missing or stale element_id
+            element = self.current_element_map.get(params.get('element_id'))
+            try:
+                return bool(handler(params, element))
+            finally:
+                # Typing/selecting changes value properties, which the MutationObserver
+                # behind the page key never sees - re-read the page after anything but a scroll
+                if action != "scroll":
+                    self._last_page_key = None
                 
         except Exception as e:
             print(f"[ERROR] Failed to execute action {action}: {e}")
             return False
     
+    def _do_type(self, params: Dict[str, Any], element) -> bool:
+        text = params.get('text')
+        return bool(element and text) and self.actions.type_text(element, text)
+    
+    def _do_click(self, params: Dict[str, Any], element) -> bool:
+        if not element:
+            return False
+        result = self.actions.click_element(element)
+        if result:
+            # click_element has already paused after the action, so don't add another one
+            self.actions.wait_for_page_load(settle=False)
+        return result
+    
+    def _do_submit(self, params: Dict[str, Any], element) -> bool:
+        if not element:
+            return False
+        result = self.actions.submit_form(element)
+        if result:
+            # submit_form has already paused after the action, so don't add another one
+            self.actions.wait_for_page_load(settle=False)
+        return result
+    
+    def _do_scroll(self, params: Dict[str, Any], element) -> bool:
+        return self.actions.scroll_page(params.get('direction', 'down'))
+    
+    def _do_select(self, params: Dict[str, Any], element) -> bool:
+        option = params.get('option')
+        return bool(element and option) and self.actions.select_option(element, option)
+    
     def run(self, task: str, start_url: str = None) -> Dict[str, Any]:
         """Run the agent to complete a task"""
         
@@ -433,11 +673,23 @@ What should be the next action to complete the task?"""
                     "history": self.conversation_history
                 }
             
+            # The same action already failed on this exact page state - retrying can only loop
+            attempt = (tuple(self._last_page_key or ()), decision['action'],
+                       json.dumps(decision.get('parameters', {}), sort_keys=True))
+            if attempt in self._failed_attempts:
+                return {
+                    "success": False,
+                    "error": f"Repeated failing action '{decision['action']}' on an unchanged page",
+                    "steps": self.current_step,
+                    "history": self.conversation_history
+                }
+            
             # Execute the action
             success = self.execute_action(decision)
             
             if not success:
                 print(f"[WARN] Action failed, retrying...")
+                self._failed_attempts.add(attempt)
                 # Continue to next iteration to retry
             
             # Small delay between actions
@@ -455,25 +707,23 @@ What should be the next action to complete the task?"""
         """Perform a Google search with enhanced anti-detection"""
         print(f"[AGENT] Searching for: {query}")
         
+        cache_key = " ".join(query.lower().split())
+        if self.cache_searches:
+            with _QUERY_CACHE_LOCK:
+                hit = _QUERY_CACHE.get(cache_key)
+            if hit is not None and time.monotonic() - hit[0] < _QUERY_CACHE_TTL:
+                print(f"[AGENT] Reusing results from {int(time.monotonic() - hit[0])}s ago")
+                return {"success": True, "query": query, "results": hit[1], "url": hit[2]}
+        
         # Navigate to Google first
         if not self.navigate_to_google():
             return {"success": False, "error": "Failed to navigate to Google"}
         
         # Find the search box
-        search_box = None
         try:
-            # Try different selectors for the search box
-            selectors = [
-                'input[name="q"]',
-                'textarea[name="q"]',
-                'input[type="search"]',
-                '#APjFqb'  # Google's current search box ID
-            ]
-            
-            for selector in selectors:
-                search_box = self.actions.wait_for_element(selector, timeout=3)
-                if search_box:
-                    break
+            # All search box selectors at once; only wait if the box hasn't rendered yet
+            search_box = (self.driver.execute_script(_FIRST_VISIBLE_JS, _SEARCH_BOX_SELECTOR)
+                          or self.actions.wait_for_element(_SEARCH_BOX_SELECTOR, timeout=3))
             
             if not search_box:
                 return {"success": False, "error": "Could not find search box"}
@@ -482,49 +732,53 @@ What should be the next action to complete the task?"""
             print("[AGENT] Found search box, preparing to search...")
             
             # Wait before interacting (longer, more human)
-            time.sleep(random.uniform(2.0, 4.0))
+            time.sleep(self._rng.uniform(2.0, 4.0))
             
             # Sometimes click elsewhere first then search box (human behavior)
-            if random.random() < 0.3:
+            if self._rng.random() < 0.3:
                 try:
                     # Click on page background first
                     self.driver.execute_script("document.body.click();")
-                    time.sleep(random.uniform(0.5, 1.0))
+                    time.sleep(self._rng.uniform(0.5, 1.0))
                 except:
                     pass
             
             # Click on search box (important - triggers Google's JS)
             self.actions.click_element(search_box)
-            time.sleep(random.uniform(0.8, 1.5))
+            time.sleep(self._rng.uniform(0.8, 1.5))
             
             # Sometimes start typing then delete (human behavior)
-            if random.random() < 0.15:  # 15% chance
-                fake_text = random.choice(["weather", "news", "how to"])
-                self.actions.type_text(search_box, fake_text[:random.randint(2, len(fake_text))], clear_first=False)
-                time.sleep(random.uniform(1.0, 2.0))
+            if self._rng.random() < 0.15:  # 15% chance
+                fake_text = self._rng.choice(["weather", "news", "how to"])
+                self.actions.type_text(search_box, fake_text[:self._rng.randint(2, len(fake_text))], clear_first=False)
+                time.sleep(self._rng.uniform(1.0, 2.0))
                 # Clear it
                 search_box.clear()
-                time.sleep(random.uniform(0.5, 1.0))
+                time.sleep(self._rng.uniform(0.5, 1.0))
             
             # Type the query slowly with more variation
             self.actions.type_text(search_box, query, clear_first=True)
             
+            # The homepage keeps reporting readyState 'complete' until the results page
+            # commits, so remember which document it is to tell the two apart
+            homepage_origin = self._eval("return performance.timeOrigin;")
+            
             # CRITICAL: Wait for suggestions to appear (longer)
-            time.sleep(random.uniform(3.0, 5.0))
+            time.sleep(self._rng.uniform(3.0, 5.0))
             
             # Sometimes interact with suggestions
-            if random.random() < 0.4:  # 40% chance to use suggestions
+            if self._rng.random() < 0.4:  # 40% chance to use suggestions
                 try:
                     suggestions = self.driver.find_elements("css selector", "[role='option']")
                     if suggestions and len(suggestions) > 1:
                         # Hover over a few suggestions
-                        for suggestion in random.sample(suggestions, min(2, len(suggestions))):
+                        for suggestion in self._pick_some(suggestions):
                             self.actions.hover_element(suggestion)
-                            time.sleep(random.uniform(0.3, 0.7))
+                            time.sleep(self._rng.uniform(0.3, 0.7))
                         
                         # Sometimes click a suggestion
-                        if random.random() < 0.5 and suggestions:
-                            random.choice(suggestions).click()
+                        if self._rng.random() < 0.5 and suggestions:
+                            self._rng.choice(suggestions).click()
                             print("[AGENT] Clicked on suggestion")
                             suggestion_clicked = True
                         else:
@@ -539,56 +793,56 @@ What should be the next action to complete the task?"""
             # Only look for search button if we didn't click a suggestion
             if not suggestion_clicked:
                 # Find and click the search button (NOT Enter key)
-                search_button = None
-                button_selectors = [
-                    'input[name="btnK"]',
-                    'button[aria-label*="Search"]',
-                    'input[type="submit"]'
-                ]
-                
-                for selector in button_selectors:
-                    try:
-                        search_button = self.driver.find_element("css selector", selector)
-                        if search_button and search_button.is_displayed():
-                            break
-                    except:
-                        continue
+                search_button = self.driver.execute_script(_FIRST_VISIBLE_JS, _SEARCH_BUTTON_SELECTOR)
                 
                 # Decide whether to click button or press Enter (mix it up)
-                use_enter = random.random() < 0.3  # 30% chance to use Enter
+                use_enter = self._rng.random() < 0.3  # 30% chance to use Enter
                 
                 if search_button and not use_enter:
                     print("[AGENT] Clicking search button...")
                     # Move to button and click with more delay
-                    time.sleep(random.uniform(1.0, 2.0))
+                    time.sleep(self._rng.uniform(1.0, 2.0))
                     self.actions.scroll_to_element(search_button)
-                    time.sleep(random.uniform(0.8, 1.5))
+                    time.sleep(self._rng.uniform(0.8, 1.5))
                     self.actions.click_element(search_button)
                 else:
                     # Use Enter key
                     print("[AGENT] Using Enter key...")
-                    time.sleep(random.uniform(1.5, 3.0))
+                    time.sleep(self._rng.uniform(1.5, 3.0))
                     search_box.send_keys(Keys.RETURN)
             
-            # Wait for results to load (longer, more human)
-            time.sleep(random.uniform(4.0, 7.0))
-            self.actions.wait_for_page_load()
+            # Wait for results to load: a new document with results (or the bot check) in it,
+            # then until its late requests settle
+            try:
+                WebDriverWait(self.driver, 15, poll_frequency=0.2,
+                              ignored_exceptions=(JavascriptException,)).until(
+                    lambda d: d.execute_script(_RESULTS_READY_JS, homepage_origin))
+            except TimeoutException:
+                return {"success": False, "error": "Results page did not load"}
+            self.actions.wait_for_network_idle(timeout=7)
+            
+            # Bot check and results together - the top 10 are already there before any scrolling
+            page = self._eval(_RESULTS_PAGE_JS)
             
             # Check if we got results or bot page
-            if "sorry" in self.driver.page_source.lower() and "unusual traffic" in self.driver.page_source.lower():
+            if page['blocked']:
                 return {"success": False, "error": "Detected by Google bot protection"}
             
             # Human-like behavior after getting results
             self._explore_search_results()
             
-            # Extract results
-            results = self.extract_search_results()
+            if self.cache_searches:
+                with _QUERY_CACHE_LOCK:
+                    _QUERY_CACHE[cache_key] = (time.monotonic(), page['results'], page['url'])
+                    _QUERY_CACHE.move_to_end(cache_key)
+                    if len(_QUERY_CACHE) > _QUERY_CACHE_SIZE:
+                        _QUERY_CACHE.popitem(last=False)
             
             return {
                 "success": True,
                 "query": query,
-                "results": results,
-                "url": self.driver.current_url
+                "results": page['results'],
+                "url": page['url']
             }
             
         except Exception as e:
@@ -602,16 +856,8 @@ What should be the next action to complete the task?"""
     
     def _format_history(self) -> str:
         """Format action history for Claude"""
-        if not self.conversation_history:
-            return "None"
-        
-        formatted = []
-        for entry in self.conversation_history[-5:]:  # Last 5 actions
-            action = entry['action']
-            params = entry.get('parameters', {})
-            formatted.append(f"Step {entry['step']}: {action} {params}")
-        
-        return "\n".join(formatted)
+        # Last 5 actions, already formatted when they were recorded
+        return "\n".join(self._recent_actions) or "None"
     
     def extract_search_results(self) -> List[Dict[str, str]]:
         """Extract search results from current Google search page"""
@@ -619,28 +865,7 @@ What should be the next action to complete the task?"""
         results = []
         
         # Use JavaScript to extract Google search results
-        extracted = self.driver.execute_script("""
-            const results = [];
-            const searchResults = document.querySelectorAll('.g');
-            
-            searchResults.forEach((result, index) => {
-                if (index < 10) {  // Limit to 10 results
-                    const link = result.querySelector('a');
-                    const title = result.querySelector('h3');
-                    const description = result.querySelector('.VwiC3b, .st, .IsZvec');
-                    
-                    if (link && title) {
-                        results.push({
-                            title: title.innerText || '',
-                            url: link.href || '',
-                            description: description ? description.innerText : ''
-                        });
-                    }
-                }
-            });
-            
-            return results;
-        """)
+        extracted = self._eval(_SEARCH_RESULTS_JS)
         
         return extracted
     
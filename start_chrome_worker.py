@@ -0,0 +1,78 @@
+"""
+Chrome Worker - keep one proxied Chrome running for repeated proxy tests
+
+Starts Selenium-Wire's local proxy (chained to BRIGHTDATA_PROXY) and a single Chrome
+with --remote-debugging-port, then waits. Successive test runs attach to it with:
+
+    python brightdata_proxy_headless.py --driver-endpoint 127.0.0.1:9222
+
+so they skip the Chrome + chromedriver launch entirely. Ctrl+C stops both.
+"""
+
+import argparse
+import subprocess
+import sys
+
+from seleniumwire import backend
+from undetected_chromedriver import find_chrome_executable
+
+from brightdata_proxy_headless import (
+    BRIGHTDATA_PROXY, PROFILE_DIR, die, install_cas, prepare_profile_dir, seleniumwire_options,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Start a long-lived proxied Chrome for --driver-endpoint runs")
+    parser.add_argument("--port", type=int, default=9222, help="Remote debugging port (default: 9222)")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--fresh-profile", action="store_true",
+                        help="Delete and recreate the Chrome profile instead of reusing it")
+    args = parser.parse_args()
+
+    if not BRIGHTDATA_PROXY:
+        die("BRIGHTDATA_PROXY not set (in .env locally or injected via ECS task secrets)")
+
+    chrome = find_chrome_executable()
+    if not chrome:
+        die("Chrome executable not found")
+
+    prepare_profile_dir(fresh=args.fresh_profile)
+    install_cas()
+
+    proxy = backend.create(options=seleniumwire_options())
+    proxy_host, proxy_port = proxy.address()[:2]
+    print(f"[INFO] Selenium-Wire proxy listening on {proxy_host}:{proxy_port}")
+
+    cmd = [
+        chrome,
+        f"--remote-debugging-port={args.port}",
+        f"--user-data-dir={PROFILE_DIR}",
+        f"--proxy-server={proxy_host}:{proxy_port}",
+        "--proxy-bypass-list=<-loopback>",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-gpu",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+    ]
+    if not args.headed:
+        cmd.append("--headless=new")
+    cmd.append("about:blank")
+
+    print(f"[INFO] Starting Chrome worker: debugger at 127.0.0.1:{args.port}, profile {PROFILE_DIR}")
+    chrome_proc = subprocess.Popen(cmd)
+    print(f"[INFO] Attach with: python brightdata_proxy_headless.py --driver-endpoint 127.0.0.1:{args.port}")
+
+    try:
+        chrome_proc.wait()
+    except KeyboardInterrupt:
+        print("\n[INFO] Stopping Chrome worker...")
+        chrome_proc.terminate()
+        chrome_proc.wait()
+    finally:
+        proxy.shutdown()
+    sys.exit(chrome_proc.returncode or 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,52 +3,101 @@ Test Script - Verify Google Search Agent components
 Run this to test that all modules are working correctly
 """
 
+import argparse
+import atexit
+import importlib
 import os
 import sys
-from dotenv import load_dotenv
+import time
+from pathlib import Path
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from the .env beside this script, if there is one,
+# the same file main.py reads (no directory walk to look for it)
+_ENV_FILE = Path(__file__).resolve().with_name('.env')
+if _ENV_FILE.is_file():
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_FILE, override=False)
+
+# Read once for the environment check and the agent test
+API_KEY = os.getenv("ANTHROPIC_API_KEY")
+
+# Project modules checked by test_imports, in dependency order, and the seconds each took
+# to import the first time (including any dependencies it was first to pull in)
+MODULES = ["browser_setup", "dom_extractor", "actions", "search_agent", "main"]
+IMPORT_TIMES = {}
+
+
+def _import_timed(name):
+    """importlib.import_module, recording how long the first import of name took"""
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+# What the browser tests use; if any of this fails to import, test_imports reports it and
+# the tests that need it are skipped, so it is never used unbound. browser_setup exits
+# when its dependencies are missing; let that happen in test_imports, not at import
+try:
+    create_browser = _import_timed("browser_setup").create_browser
+    DOMExtractor = _import_timed("dom_extractor").DOMExtractor
+    _import_timed("actions")
+    GoogleSearchAgent = _import_timed("search_agent").GoogleSearchAgent
+except (ImportError, SystemExit):
+    pass
+
+# Bright Data CA certificate file, used when the certificate isn't in the environment
+_CA_FILE = _ENV_FILE.with_name("brightdata_ca.crt")
+
+# One browser shared by the browser tests, so Chrome cold-starts once per run; quit by run_all_tests
+_driver = None
+
+
+def get_driver():
+    """The shared headless mobile browser, launched on first use and reset to a blank page after"""
+    global _driver
+    if _driver is None:
+        print("Creating headless mobile browser...")
+        _driver = create_browser(headless=True, mobile=True)
+    else:
+        # Don't let one test's cookies, site storage or page leak into the next. The HTTP
+        # cache is kept: reusing it is much of what makes sharing the browser cheap
+        origin = _driver.execute_script("return location.origin")
+        if origin.startswith("http"):
+            _driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": origin,
+                "storageTypes": "local_storage,indexeddb,service_workers,cache_storage"
+            })
+        # Every domain's cookies (delete_all_cookies only clears the current page's)
+        _driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        _driver.get("about:blank")
+    return _driver
+
+
+def close_driver():
+    """Quit the shared browser if one was launched"""
+    global _driver
+    if _driver is not None:
+        _driver.quit()
+        _driver = None
+        print("✓ Browser closed successfully")
+
+
+# Still quit the browser if the run is cut short before run_all_tests gets to it
+atexit.register(close_driver)
 
 
 def test_imports():
     """Test that all modules can be imported"""
     print("Testing module imports...")
     
-    try:
-        import browser_setup
-        print("✓ browser_setup imported")
-    except ImportError as e:
-        print(f"✗ Failed to import browser_setup: {e}")
-        return False
-    
-    try:
-        import dom_extractor
-        print("✓ dom_extractor imported")
-    except ImportError as e:
-        print(f"✗ Failed to import dom_extractor: {e}")
-        return False
-    
-    try:
-        import actions
-        print("✓ actions imported")
-    except ImportError as e:
-        print(f"✗ Failed to import actions: {e}")
-        return False
-    
-    try:
-        import search_agent
-        print("✓ search_agent imported")
-    except ImportError as e:
-        print(f"✗ Failed to import search_agent: {e}")
-        return False
-    
-    try:
-        import main
-        print("✓ main imported")
-    except ImportError as e:
-        print(f"✗ Failed to import main: {e}")
-        return False
+    for name in MODULES:
+        try:
+            _import_timed(name)
+            print(f"✓ {name} imported ({IMPORT_TIMES[name]:.2f}s)")
+        except ImportError as e:
+            print(f"✗ Failed to import {name}: {e}")
+            return False
     
     return True
 
@@ -57,9 +106,8 @@ def test_environment():
     """Test environment variables"""
     print("\nTesting environment variables...")
     
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if api_key:
-        print(f"✓ ANTHROPIC_API_KEY found (length: {len(api_key)})")
+    if API_KEY:
+        print(f"✓ ANTHROPIC_API_KEY found (length: {len(API_KEY)})")
     else:
         print("✗ ANTHROPIC_API_KEY not found - agent will not work without this")
         print("  Set it in .env file or as environment variable")
@@ -73,14 +121,12 @@ def test_environment():
     bd_ca = os.getenv("BRIGHTDATA_CA_B64") or os.getenv("BRIGHTDATA_CA_PEM")
     if bd_ca:
         print("✓ Bright Data CA certificate found in environment")
+    elif _CA_FILE.exists():
+        print("✓ Bright Data CA certificate found as file")
     else:
-        from pathlib import Path
-        if (Path(__file__).parent / "brightdata_ca.crt").exists():
-            print("✓ Bright Data CA certificate found as file")
-        else:
-            print("⚠ Bright Data CA certificate not found - may have issues with proxy")
+        print("⚠ Bright Data CA certificate not found - may have issues with proxy")
     
-    return api_key is not None
+    return API_KEY is not None
 
 
 def test_browser_creation():
@@ -88,13 +134,10 @@ def test_browser_creation():
     print("\nTesting browser creation...")
     
     try:
-        from browser_setup import create_browser
-        
-        print("Creating headless mobile browser...")
-        driver = create_browser(headless=True, mobile=True)
+        driver = get_driver()
         
         print("✓ Browser created successfully")
-        print(f"  User Agent: {driver.execute_script('return navigator.userAgent')[:50]}...")
+        print(f"  User Agent: {driver.user_agent[:50]}...")
         
         # Test navigation
         print("Testing navigation to Google...")
@@ -105,9 +148,6 @@ def test_browser_creation():
         else:
             print(f"⚠ Unexpected URL: {driver.current_url}")
         
-        driver.quit()
-        print("✓ Browser closed successfully")
-        
         return True
         
     except Exception as e:
@@ -120,10 +160,7 @@ def test_dom_extraction():
     print("\nTesting DOM extraction...")
     
     try:
-        from browser_setup import create_browser
-        from dom_extractor import DOMExtractor
-        
-        driver = create_browser(headless=True, mobile=True)
+        driver = get_driver()
         driver.get("https://www.google.com")
         
         extractor = DOMExtractor(driver)
@@ -132,16 +169,15 @@ def test_dom_extraction():
         print("✓ DOM extracted successfully")
         print(f"  Title: {page_info['title']}")
         print(f"  URL: {page_info['url']}")
-        print(f"  Interactive elements found: {len(page_info['elements'])}")
+        print(f"  Interactive elements found: {sum(map(len, page_info['elements'].values()))}")
         
         # Check for search box
-        search_inputs = [e for e in page_info['elements'] if e['type'] == 'input' and e['purpose'] == 'search']
-        if search_inputs:
+        search_input = next((e for e in page_info['elements']['inputs'] if e['purpose'] == 'search'), None)
+        if search_input:
             print(f"✓ Found search input field")
         else:
             print("⚠ No search input found")
         
-        driver.quit()
         return True
         
     except Exception as e:
@@ -153,17 +189,13 @@ def test_agent_initialization():
     """Test agent initialization"""
     print("\nTesting agent initialization...")
     
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
+    if not API_KEY:
         print("⚠ Skipping agent test - no API key")
         return False
     
     try:
-        from browser_setup import create_browser
-        from search_agent import GoogleSearchAgent
-        
-        driver = create_browser(headless=True, mobile=True)
-        agent = GoogleSearchAgent(driver, api_key=api_key)
+        driver = get_driver()
+        agent = GoogleSearchAgent(driver, api_key=API_KEY)
         
         print("✓ Agent initialized successfully")
         print(f"  Max steps: {agent.max_steps}")
@@ -175,7 +207,6 @@ def test_agent_initialization():
         else:
             print("✗ Agent failed to navigate to Google")
         
-        driver.quit()
         return success
         
     except Exception as e:
@@ -183,46 +214,41 @@ def test_agent_initialization():
         return False
 
 
-def run_all_tests():
-    """Run all tests"""
+# (name, test, names of the tests it needs to have passed), in run order
+TESTS = [
+    ("Module Imports", test_imports, []),
+    ("Environment Setup", test_environment, []),
+    ("Browser Creation", test_browser_creation, ["Module Imports"]),
+    ("DOM Extraction", test_dom_extraction, ["Browser Creation"]),
+    ("Agent Initialization", test_agent_initialization, ["Environment Setup", "Browser Creation"]),
+]
+
+
+def run_all_tests(skip=()):
+    """Run all tests, except those named in skip (and the tests that depend on them)"""
     print("="*60)
     print("GOOGLE SEARCH AGENT - Component Test Suite")
     print("="*60)
     
-    results = []
-    
-    # Test imports
-    results.append(("Module Imports", test_imports()))
-    
-    # Test environment
-    results.append(("Environment Setup", test_environment()))
-    
-    # Test browser
-    if results[0][1]:  # Only if imports passed
-        results.append(("Browser Creation", test_browser_creation()))
-        
-        # Test DOM extraction
-        if results[2][1]:  # Only if browser works
-            results.append(("DOM Extraction", test_dom_extraction()))
-        
-        # Test agent
-        if results[1][1]:  # Only if environment is set up
-            results.append(("Agent Initialization", test_agent_initialization()))
-    
-    # Summary
-    print("\n" + "="*60)
-    print("TEST SUMMARY")
-    print("="*60)
-    
-    for test_name, passed in results:
-        status = "✓ PASSED" if passed else "✗ FAILED"
-        print(f"{test_name:25} {status}")
+    outcomes = {}
+    try:
+        for name, test, depends_on in TESTS:
+            # Skip a test whose prerequisites failed or were themselves skipped
+            if name not in skip and all(outcomes.get(dep) for dep in depends_on):
+                outcomes[name] = test()
+    finally:
+        close_driver()
+    results = list(outcomes.items())
     
-    total_passed = sum(1 for _, passed in results if passed)
+    total_passed = sum(passed for _, passed in results)
     total_tests = len(results)
     
-    print("="*60)
-    print(f"Results: {total_passed}/{total_tests} tests passed")
+    # Summary, built up and written in one go
+    lines = ["\n" + "="*60, "TEST SUMMARY", "="*60]
+    lines.extend(f"{test_name:25} {'✓ PASSED' if passed else '✗ FAILED'}" for test_name, passed in results)
+    lines.append("="*60)
+    lines.append(f"Results: {total_passed}/{total_tests} tests passed")
+    print("\n".join(lines))
     
     if total_passed == total_tests:
         print("\n✓ All tests passed! The agent is ready to use.")
@@ -232,7 +258,7 @@ def run_all_tests():
         print("  python main.py --task 'task'      # Task mode")
     else:
         print("\n⚠ Some tests failed. Please check the errors above.")
-        if not results[1][1]:
+        if not outcomes["Environment Setup"]:
             print("\nMost importantly, set your ANTHROPIC_API_KEY in the .env file:")
             print("  ANTHROPIC_API_KEY=your_api_key_here")
     
@@ -240,5 +266,10 @@ def run_all_tests():
 
 
 if __name__ == "__main__":
-    success = run_all_tests()
+    parser = argparse.ArgumentParser(description="Verify Google Search Agent components")
+    parser.add_argument("--no-browser", action="store_true",
+                        help="Only check imports and environment - skip everything that launches Chrome")
+    args = parser.parse_args()
+    
+    success = run_all_tests(skip={"Browser Creation"} if args.no_browser else ())
     sys.exit(0 if success else 1)
\ No newline at end of file